@@ -1,6 +1,8 @@
 import os
 import logging
 import time
+import inspect
+import functools
 from datetime import datetime, timedelta
 from binance.spot import Spot
 from binance.error import ClientError
@@ -17,6 +19,43 @@ except ImportError:
     WebSocketException = Exception
     WEBSOCKET_EXCEPTIONS_AVAILABLE = False
 
+def _log_failure(action):
+    """
+    Decorator for client calls that log and re-raise any failure
+
+    The action may reference the call's arguments, e.g. "get {symbol} price";
+    it is only formatted when the call actually fails.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            except Exception as e:
+                arguments = signature.bind_partial(self, *args, **kwargs).arguments
+                self.logger.error("Failed to %s: %s", action.format(**arguments), e)
+                raise
+        return wrapper
+    return decorator
+
+def _invalidates_balances(func):
+    """
+    Decorator for calls that change account balances (order placement and cancellation)
+
+    The cached balance snapshot is dropped both before and after the call, so
+    a snapshot fetched while the order was in flight is never reused.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        self._invalidate_balance_cache()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self._invalidate_balance_cache()
+    return wrapper
+
 # Import the WebSocket API client
 try:
     from .websocket_api_client import BinanceWSClient
@@ -26,13 +65,13 @@ except ImportError:
 
 class BinanceClient:
     def __init__(self):
-        # Get API key from environment variables
-        self.api_key = os.getenv("API_KEY", config.API_KEY)
-        self.api_secret = os.getenv("API_SECRET", getattr(config, "API_SECRET", None))
+        # Credentials are read from the environment once, by config
+        self.api_key = config.API_KEY
+        self.api_secret = getattr(config, "API_SECRET", None)
         # Get private key file path
-        private_key_path = os.getenv("PRIVATE_KEY", config.PRIVATE_KEY)
-        self.private_key_pass = None if os.getenv("PRIVATE_KEY_PASS") == "None" else os.getenv("PRIVATE_KEY_PASS", 
-                                getattr(config, 'PRIVATE_KEY_PASS', None))
+        self.private_key_path = config.PRIVATE_KEY
+        private_key_path = self.private_key_path
+        self.private_key_pass = getattr(config, 'PRIVATE_KEY_PASS', None)
         self.base_url = config.BASE_URL
         self.use_testnet = config.USE_TESTNET
         self.logger = logging.getLogger(__name__)
@@ -45,8 +84,11 @@ class BinanceClient:
         self._symbol_info_cache = {}  # Cache symbol info for precision formatting
         self.user_stream_subscription_id = None
         self.user_stream_mode = None  # "ws_api" or "listen_key"
-        self._book_ticker_cache = {}  # Cache for best bid/ask
+        self._book_ticker_cache = {}  # Cache for best bid/ask, timestamped with time.monotonic()
         self.book_ticker_ttl_ms = 2000  # Cache freshness window
+        self._balance_cache = None  # Last free balances (asset -> free) fetched by check_balance
+        self._balance_epoch = 0  # Bumped by every order write; stale fetches are not cached
+        self.balance_ttl_ms = 1000  # Balance snapshot freshness window
 
         # Add time offset variable for server time synchronization
         self.time_offset = 0
@@ -549,77 +591,62 @@ class BinanceClient:
             _, precision = self._get_symbol_precisions(symbol)
         return format_quantity(quantity, precision)
 
+    @_log_failure("get exchange info")
     def get_exchange_info(self, symbol=None):
         """Get exchange information"""
         # Periodically retry WebSocket connection if it's down
         if not self.websocket_available and (int(time.time()) % 60 == 0):
             self._retry_websocket_connection()
             
-        try:
-            if symbol:
-                resp = self._execute_with_fallback("exchange_info", "exchange_info", symbol=symbol)
-            else:
-                resp = self._execute_with_fallback("exchange_info", "exchange_info")
-            return self._unwrap_response(resp)
-        except Exception as e:
-            self.logger.error(f"Failed to get exchange info: {e}")
-            raise
+        if symbol:
+            resp = self._execute_with_fallback("exchange_info", "exchange_info", symbol=symbol)
+        else:
+            resp = self._execute_with_fallback("exchange_info", "exchange_info")
+        return self._unwrap_response(resp)
 
+    @_log_failure("get symbol info")
     def get_symbol_info(self, symbol):
         """Get symbol information"""
-        try:
-            info = self.get_exchange_info(symbol=symbol)
-            if info and "symbols" in info and len(info["symbols"]) > 0:
-                return info["symbols"][0]
-            return None
-        except Exception as e:
-            self.logger.error(f"Failed to get symbol info: {e}")
-            raise
+        info = self.get_exchange_info(symbol=symbol)
+        if info and "symbols" in info and len(info["symbols"]) > 0:
+            return info["symbols"][0]
+        return None
 
+    @_log_failure("get account info")
     def get_account_info(self):
         """Get account information"""
-        try:
-            resp = self._execute_with_fallback("account", "account")
-            return self._unwrap_response(resp)
-        except Exception as e:
-            self.logger.error(f"Failed to get account info: {e}")
-            raise
+        resp = self._execute_with_fallback("account", "account")
+        return self._unwrap_response(resp)
 
+    @_log_failure("get {symbol} price")
     def get_symbol_price(self, symbol):
         """Get current price for symbol"""
-        try:
-            ticker = self._execute_with_fallback("ticker_price", "ticker_price", symbol=symbol)
-            ticker = self._unwrap_response(ticker)
-            if isinstance(ticker, dict):
-                if "price" in ticker:
-                    return float(ticker["price"])
-                if "result" in ticker and "price" in ticker["result"]:
-                    return float(ticker["result"]["price"])
-            raise ValueError("Unexpected ticker response format")
-        except Exception as e:
-            self.logger.error(f"Failed to get {symbol} price: {e}")
-            raise
+        ticker = self._execute_with_fallback("ticker_price", "ticker_price", symbol=symbol)
+        ticker = self._unwrap_response(ticker)
+        if isinstance(ticker, dict):
+            if "price" in ticker:
+                return float(ticker["price"])
+            if "result" in ticker and "price" in ticker["result"]:
+                return float(ticker["result"]["price"])
+        raise ValueError("Unexpected ticker response format")
 
+    @_log_failure("get order book for {symbol}")
     def get_order_book(self, symbol, limit=20):
         """Get order book depth for slippage estimation"""
-        try:
-            resp = self._execute_with_fallback(
-                "depth",
-                "depth",
-                symbol=symbol,
-                limit=limit
-            )
-            return self._unwrap_response(resp)
-        except Exception as e:
-            self.logger.error(f"Failed to get order book for {symbol}: {e}")
-            raise
+        resp = self._execute_with_fallback(
+            "depth",
+            "depth",
+            symbol=symbol,
+            limit=limit
+        )
+        return self._unwrap_response(resp)
 
     def _get_cached_book_ticker(self, symbol, max_age_ms):
         """Return cached book ticker if fresh enough"""
         entry = self._book_ticker_cache.get(symbol)
         if not entry:
             return None
-        age_ms = (time.time() - entry["ts"]) * 1000
+        age_ms = (time.monotonic() - entry["ts"]) * 1000
         if age_ms <= max_age_ms:
             return entry["data"]
         return None
@@ -660,7 +687,7 @@ class BinanceClient:
         if not isinstance(ticker, dict) or "bidPrice" not in ticker or "askPrice" not in ticker:
             raise ValueError(f"Unexpected book ticker response for {symbol}: {ticker}")
 
-        self._book_ticker_cache[symbol] = {"data": ticker, "ts": time.time()}
+        self._book_ticker_cache[symbol] = {"data": ticker, "ts": time.monotonic()}
         return ticker
 
     def get_best_bid_ask(self, symbol, allow_stale_ms=None):
@@ -685,6 +712,8 @@ class BinanceClient:
 
         return float(ticker["bidPrice"]), float(ticker["askPrice"])
             
+    @_log_failure("place limit order")
+    @_invalidates_balances
     def place_limit_order(
         self,
         symbol,
@@ -698,48 +727,46 @@ class BinanceClient:
         recv_window=None,
     ):
         """Place limit order"""
+        # Validate and format price before sending
         try:
-            # Validate and format price before sending
-            try:
-                price_float = float(price)
-                if price_float <= 0:
-                    self.logger.error(f"Invalid price value: {price} for {side} order")
-                    raise ValueError(f"Invalid price value: {price}")
-            except (ValueError, TypeError):
-                self.logger.error(f"Non-numeric price value: {price} for {side} order")
-                raise ValueError(f"Non-numeric price value: {price}")
-                
-            # Format price and quantity according to symbol filters
-            formatted_price = self._adjust_price_precision(price_float, symbol)
-            formatted_quantity = self._adjust_quantity_precision(quantity, symbol)
+            price_float = float(price)
+            if price_float <= 0:
+                self.logger.error(f"Invalid price value: {price} for {side} order")
+                raise ValueError(f"Invalid price value: {price}")
+        except (ValueError, TypeError):
+            self.logger.error(f"Non-numeric price value: {price} for {side} order")
+            raise ValueError(f"Non-numeric price value: {price}")
             
-            # Ensure using string formats
-            params = {
-                'symbol': symbol,
-                'side': side,
-                'type': 'LIMIT',
-                'timeInForce': time_in_force or 'GTC',
-                'quantity': formatted_quantity,
-                'price': formatted_price  # Use formatted price
-            }
+        # Format price and quantity according to symbol filters
+        formatted_price = self._adjust_price_precision(price_float, symbol)
+        formatted_quantity = self._adjust_quantity_precision(quantity, symbol)
+        
+        # Ensure using string formats
+        params = {
+            'symbol': symbol,
+            'side': side,
+            'type': 'LIMIT',
+            'timeInForce': time_in_force or 'GTC',
+            'quantity': formatted_quantity,
+            'price': formatted_price  # Use formatted price
+        }
 
-            if new_client_order_id:
-                params['newClientOrderId'] = new_client_order_id
-            if new_order_resp_type:
-                params['newOrderRespType'] = new_order_resp_type
-            if self_trade_prevention_mode:
-                params['selfTradePreventionMode'] = self_trade_prevention_mode
-            if recv_window:
-                params['recvWindow'] = recv_window
-            
-            self.logger.debug(f"Placing {side} limit order: {quantity} @ {formatted_price}")
-            response = self._execute_with_fallback("new_order", "new_order", **params)
-            response = self._unwrap_response(response)
-            return response
-        except Exception as e:
-            self.logger.error(f"Failed to place limit order: {e}")
-            raise
+        if new_client_order_id:
+            params['newClientOrderId'] = new_client_order_id
+        if new_order_resp_type:
+            params['newOrderRespType'] = new_order_resp_type
+        if self_trade_prevention_mode:
+            params['selfTradePreventionMode'] = self_trade_prevention_mode
+        if recv_window:
+            params['recvWindow'] = recv_window
+        
+        self.logger.debug(f"Placing {side} limit order: {quantity} @ {formatted_price}")
+        response = self._execute_with_fallback("new_order", "new_order", **params)
+        response = self._unwrap_response(response)
+        return response
             
+    @_log_failure("place market order")
+    @_invalidates_balances
     def place_market_order(
         self,
         symbol,
@@ -751,50 +778,42 @@ class BinanceClient:
         recv_window=None,
     ):
         """Place market order"""
-        try:
-            formatted_quantity = self._adjust_quantity_precision(quantity, symbol)
-            params = {
-                'symbol': symbol,
-                'side': side,
-                'type': 'MARKET',
-                'quantity': formatted_quantity  # Ensure using string format
-            }
-            if new_client_order_id:
-                params['newClientOrderId'] = new_client_order_id
-            if new_order_resp_type:
-                params['newOrderRespType'] = new_order_resp_type
-            if self_trade_prevention_mode:
-                params['selfTradePreventionMode'] = self_trade_prevention_mode
-            if recv_window:
-                params['recvWindow'] = recv_window
-            response = self._execute_with_fallback("new_order", "new_order", **params)
-            response = self._unwrap_response(response)
-            return response
-        except Exception as e:
-            self.logger.error(f"Failed to place market order: {e}")
-            raise
+        formatted_quantity = self._adjust_quantity_precision(quantity, symbol)
+        params = {
+            'symbol': symbol,
+            'side': side,
+            'type': 'MARKET',
+            'quantity': formatted_quantity  # Ensure using string format
+        }
+        if new_client_order_id:
+            params['newClientOrderId'] = new_client_order_id
+        if new_order_resp_type:
+            params['newOrderRespType'] = new_order_resp_type
+        if self_trade_prevention_mode:
+            params['selfTradePreventionMode'] = self_trade_prevention_mode
+        if recv_window:
+            params['recvWindow'] = recv_window
+        response = self._execute_with_fallback("new_order", "new_order", **params)
+        response = self._unwrap_response(response)
+        return response
             
+    @_log_failure("cancel order")
+    @_invalidates_balances
     def cancel_order(self, symbol, order_id):
         """Cancel order"""
-        try:
-            response = self._execute_with_fallback("cancel_order", "cancel_order", symbol=symbol, orderId=order_id)
-            return self._unwrap_response(response)
-        except Exception as e:
-            self.logger.error(f"Failed to cancel order: {e}")
-            raise
+        response = self._execute_with_fallback("cancel_order", "cancel_order", symbol=symbol, orderId=order_id)
+        return self._unwrap_response(response)
             
+    @_log_failure("get open orders")
     def get_open_orders(self, symbol=None):
         """Get open orders"""
-        try:
-            if symbol:
-                resp = self._execute_with_fallback("get_open_orders", "get_open_orders", symbol=symbol)
-            else:
-                resp = self._execute_with_fallback("get_open_orders", "get_open_orders")
-            return self._unwrap_response(resp)
-        except Exception as e:
-            self.logger.error(f"Failed to get open orders: {e}")
-            raise
+        if symbol:
+            resp = self._execute_with_fallback("get_open_orders", "get_open_orders", symbol=symbol)
+        else:
+            resp = self._execute_with_fallback("get_open_orders", "get_open_orders")
+        return self._unwrap_response(resp)
             
+    @_log_failure("get order status")
     def get_order(self, symbol, order_id=None, orig_client_order_id=None):
         """
         Get a specific order status (WS: order.status, REST: get_order)
@@ -807,26 +826,19 @@ class BinanceClient:
             params["orderId"] = order_id
         if orig_client_order_id:
             params["origClientOrderId"] = orig_client_order_id
-        try:
-            resp = self._execute_with_fallback("order_status", "get_order", **params)
-            return self._unwrap_response(resp)
-        except Exception as e:
-            self.logger.error(f"Failed to get order status: {e}")
-            raise
+        resp = self._execute_with_fallback("order_status", "get_order", **params)
+        return self._unwrap_response(resp)
             
+    @_log_failure("get klines data")
     def get_historical_klines(self, symbol, interval, start_str=None, limit=500):
         """Get historical klines data"""
-        try:
-            resp = self._execute_with_fallback("klines", "klines",
-                symbol=symbol,
-                interval=interval,
-                startTime=start_str,
-                limit=limit
-            )
-            return self._unwrap_response(resp)
-        except Exception as e:
-            self.logger.error(f"Failed to get klines data: {e}")
-            raise
+        resp = self._execute_with_fallback("klines", "klines",
+            symbol=symbol,
+            interval=interval,
+            startTime=start_str,
+            limit=limit
+        )
+        return self._unwrap_response(resp)
     
     # Add get_klines as alias for get_historical_klines for compatibility
     def get_klines(self, symbol, interval, start_str=None, limit=500):
@@ -845,66 +857,63 @@ class BinanceClient:
         self.logger.debug("Using get_klines alias for get_historical_klines")
         return self.get_historical_klines(symbol, interval, start_str, limit)
 
+    @_log_failure("place stop loss order")
+    @_invalidates_balances
     def place_stop_loss_order(self, symbol, quantity, stop_price):
         """Place stop loss order"""
+        # Validate and format price
         try:
-            # Validate and format price
-            try:
-                stop_price_float = float(stop_price)
-                if stop_price_float <= 0:
-                    self.logger.error(f"Invalid stop price: {stop_price}")
-                    raise ValueError(f"Invalid stop price: {stop_price}")
-            except (ValueError, TypeError):
-                self.logger.error(f"Non-numeric stop price: {stop_price}")
-                raise ValueError(f"Non-numeric stop price: {stop_price}")
-                
-            # Format stop price
-            formatted_stop_price = self._adjust_price_precision(stop_price_float, symbol)
-            formatted_quantity = self._adjust_quantity_precision(quantity, symbol)
-                
-            params = {
-                'symbol': symbol,
-                'side': 'SELL',
-                'type': 'STOP_LOSS',
-                'quantity': formatted_quantity,
-                'stopPrice': formatted_stop_price
-            }
-            resp = self._execute_with_fallback("new_order", "new_order", **params)
-            return self._unwrap_response(resp)
-        except Exception as e:
-            self.logger.error(f"Failed to place stop loss order: {e}")
-            raise
+            stop_price_float = float(stop_price)
+            if stop_price_float <= 0:
+                self.logger.error(f"Invalid stop price: {stop_price}")
+                raise ValueError(f"Invalid stop price: {stop_price}")
+        except (ValueError, TypeError):
+            self.logger.error(f"Non-numeric stop price: {stop_price}")
+            raise ValueError(f"Non-numeric stop price: {stop_price}")
+            
+        # Format stop price
+        formatted_stop_price = self._adjust_price_precision(stop_price_float, symbol)
+        formatted_quantity = self._adjust_quantity_precision(quantity, symbol)
+            
+        params = {
+            'symbol': symbol,
+            'side': 'SELL',
+            'type': 'STOP_LOSS',
+            'quantity': formatted_quantity,
+            'stopPrice': formatted_stop_price
+        }
+        resp = self._execute_with_fallback("new_order", "new_order", **params)
+        return self._unwrap_response(resp)
     
+    @_log_failure("place take profit order")
+    @_invalidates_balances
     def place_take_profit_order(self, symbol, quantity, stop_price):
         """Place take profit order"""
+        # Validate and format price
         try:
-            # Validate and format price
-            try:
-                stop_price_float = float(stop_price)
-                if stop_price_float <= 0:
-                    self.logger.error(f"Invalid stop price: {stop_price}")
-                    raise ValueError(f"Invalid stop price: {stop_price}")
-            except (ValueError, TypeError):
-                self.logger.error(f"Non-numeric stop price: {stop_price}")
-                raise ValueError(f"Non-numeric stop price: {stop_price}")
-                
-            # Format stop price
-            formatted_stop_price = self._adjust_price_precision(stop_price_float, symbol)
-            formatted_quantity = self._adjust_quantity_precision(quantity, symbol)
-                
-            params = {
-                'symbol': symbol,
-                'side': 'SELL',
-                'type': 'TAKE_PROFIT',
-                'quantity': formatted_quantity,
-                'stopPrice': formatted_stop_price
-            }
-            resp = self._execute_with_fallback("new_order", "new_order", **params)
-            return self._unwrap_response(resp)
-        except Exception as e:
-            self.logger.error(f"Failed to place take profit order: {e}")
-            raise
+            stop_price_float = float(stop_price)
+            if stop_price_float <= 0:
+                self.logger.error(f"Invalid stop price: {stop_price}")
+                raise ValueError(f"Invalid stop price: {stop_price}")
+        except (ValueError, TypeError):
+            self.logger.error(f"Non-numeric stop price: {stop_price}")
+            raise ValueError(f"Non-numeric stop price: {stop_price}")
+            
+        # Format stop price
+        formatted_stop_price = self._adjust_price_precision(stop_price_float, symbol)
+        formatted_quantity = self._adjust_quantity_precision(quantity, symbol)
+            
+        params = {
+            'symbol': symbol,
+            'side': 'SELL',
+            'type': 'TAKE_PROFIT',
+            'quantity': formatted_quantity,
+            'stopPrice': formatted_stop_price
+        }
+        resp = self._execute_with_fallback("new_order", "new_order", **params)
+        return self._unwrap_response(resp)
 
+    @_invalidates_balances
     def new_oco_order(
         self,
         symbol,
@@ -1064,6 +1073,7 @@ class BinanceClient:
             self.logger.error(f"Failed to create OCO order: {e}")
             return {"result": None, "error": {"code": -1000, "msg": str(e)}, "success": False}
             
+    @_invalidates_balances
     def cancel_oco_order(self, symbol, orderListId=None, listClientOrderId=None, 
                         newClientOrderId=None, recvWindow=None):
         """
@@ -1114,29 +1124,59 @@ class BinanceClient:
         # Unwrap and validate WebSocket response if present
         return self._unwrap_response(response)
             
+    def _invalidate_balance_cache(self):
+        """Drop the cached balances after the account changed"""
+        self._balance_epoch += 1
+        self._balance_cache = None
+
+    def _get_free_balances(self):
+        """
+        Get free balances keyed by asset, reusing a snapshot younger than balance_ttl_ms
+
+        Balance checks usually come in pairs (base and quote asset) or right
+        after each other while placing grid orders, so one account request
+        serves them all. Order writes invalidate the snapshot.
+
+        Returns:
+            dict: asset -> free amount as returned by the API (string)
+        """
+        entry = self._balance_cache
+        now = time.monotonic()
+        if entry and (now - entry["ts"]) * 1000 <= self.balance_ttl_ms:
+            return entry["data"]
+
+        epoch = self._balance_epoch
+        account = self.get_account_info()
+        # Handle different response formats between WS and REST
+        balances = account.get('balances') if 'balances' in account else account.get('result', {}).get('balances', [])
+        # Index once per fetch so every check is a single lookup instead of a scan
+        free_balances = {balance['asset']: balance['free'] for balance in balances}
+        # Only cache if no order was placed or cancelled while the request was in flight
+        if epoch == self._balance_epoch:
+            self._balance_cache = {"data": free_balances, "ts": now}
+        return free_balances
+
     def check_balance(self, asset):
         """Check if balance is sufficient for an asset"""
         try:
-            account = self.get_account_info()
+            free_balances = self._get_free_balances()
             self.logger.debug(f"Looking for asset: {asset}")
             
-            # Handle different response formats between WS and REST
-            balances = account.get('balances') if 'balances' in account else account.get('result', {}).get('balances', [])
-            
-            # Debug: Log all asset names and balances
-            for bal in balances:
-                if float(bal.get('free', 0)) > 0:
-                    self.logger.debug(f"Found asset: {bal.get('asset')}, free: {bal.get('free')}")
+            # Debug: Log all asset names and balances (a full scan, so only when debug is on)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                for name, free in free_balances.items():
+                    if float(free) > 0:
+                        self.logger.debug(f"Found asset: {name}, free: {free}")
             
-            # Case-insensitive search
-            for balance in balances:
-                if balance['asset'].upper() == asset.upper():
-                    free_balance = float(balance['free'])
-                    self.logger.debug(f"Balance found for {asset}: {free_balance}")
-                    return free_balance
+            # Binance asset codes are upper case, so look up the normalised name
+            free = free_balances.get(asset.upper())
+            if free is None:
+                self.logger.warning(f"Asset {asset} not found in account balances")
+                return 0.0
             
-            self.logger.warning(f"Asset {asset} not found in account balances")
-            return 0.0
+            free_balance = float(free)
+            self.logger.debug("Balance found for %s: %s", asset, free_balance)
+            return free_balance
         except Exception as e:
             self.logger.error(f"Failed to check balance for {asset}: {e}")
             return 0.0
@@ -1193,7 +1233,7 @@ class BinanceClient:
                 # Reinitialize the client
                 self.ws_client = BinanceWSClient(
                     api_key=self.api_key,
-                    private_key_path=os.getenv("PRIVATE_KEY", config.PRIVATE_KEY),
+                    private_key_path=self.private_key_path,
                     private_key_pass=self.private_key_pass,
                     use_testnet=self.use_testnet
                 )
@@ -1220,21 +1260,7 @@ class BinanceClient:
     def _standardize_oco_response(self, response):
         """Standardize OCO order response format to ensure dict-like access"""
         
-        # Handle StandardizedMessage objects - convert them to dictionaries
-        if hasattr(response, '__class__') and response.__class__.__name__ == 'StandardizedMessage':
-            # Convert StandardizedMessage to dictionary
-            response_dict = {}
-            for attr in dir(response):
-                # Skip private attributes and methods
-                if not attr.startswith('_') and not callable(getattr(response, attr)):
-                    value = getattr(response, attr)
-                    # Recursively convert nested StandardizedMessage objects
-                    if hasattr(value, '__class__') and value.__class__.__name__ == 'StandardizedMessage':
-                        value = self._standardize_oco_response(value)
-                    response_dict[attr] = value
-            return {"result": response_dict}
-        
-        # If not a dict or StandardizedMessage, wrap in a dict with 'result' key
+        # If not a dict, wrap in a dict with 'result' key
         if not isinstance(response, dict):
             return {"result": response}
             
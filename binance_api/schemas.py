@@ -0,0 +1,161 @@
+"""
+Message schemas for Binance market and user data streams
+
+Messages are immutable and, except for depth updates, not tracked by the
+garbage collector: they cannot form reference cycles, so tracking them only
+adds collection overhead for these short-lived objects.
+"""
+from typing import Union
+from msgspec import Struct
+
+class KlineData(Struct, frozen=True, gc=False):
+    t: int          # Kline start time
+    T: int          # Kline close time
+    s: str          # Symbol
+    i: str          # Interval
+    f: int          # First trade ID
+    L: int          # Last trade ID
+    o: str          # Open price
+    c: str          # Close price
+    h: str          # High price
+    l: str          # Low price
+    v: str          # Volume
+    n: int          # Number of trades
+    x: bool         # Is closed
+    q: str          # Quote volume
+    V: str          # Taker buy volume
+    Q: str          # Taker buy quote volume
+    B: str          # Ignore
+
+class TaggedEvent(Struct, tag_field="e", frozen=True, gc=False):
+    """Base for stream events, tagged by their "e" event type for Union dispatch"""
+    
+    @property
+    def e(self):
+        """Event type, carried as the Struct tag"""
+        return self.__struct_config__.tag
+
+class KlineMessage(TaggedEvent, tag="kline"):
+    E: int          # Event time
+    s: str          # Symbol
+    k: KlineData    # Kline data
+
+class TradeMessage(TaggedEvent, tag="trade"):
+    E: int          # Event time
+    s: str          # Symbol
+    t: int          # Trade ID
+    p: str          # Price
+    q: str          # Quantity
+    b: int          # Buyer order ID
+    a: int          # Seller order ID
+    T: int          # Trade time
+    m: bool         # Is buyer market maker
+    M: bool         # Ignore
+
+class AggTradeMessage(TaggedEvent, tag="aggTrade"):
+    E: int          # Event time
+    s: str          # Symbol
+    a: int          # Aggregate trade ID
+    p: str          # Price
+    q: str          # Quantity
+    f: int          # First trade ID
+    l: int          # Last trade ID
+    T: int          # Trade time
+    m: bool         # Is buyer market maker
+    M: bool         # Ignore
+
+class BookTickerMessage(Struct, frozen=True, gc=False):
+    s: str                # Symbol
+    b: str                # Best bid price
+    B: str                # Best bid quantity
+    a: str                # Best ask price
+    A: str                # Best ask quantity
+    u: int | None = None  # Update ID, optional with default None
+
+class DepthUpdateMessage(TaggedEvent, tag="depthUpdate", frozen=False, gc=True):
+    """Depth update, kept mutable and GC-tracked since it carries price level lists"""
+    E: int          # Event time
+    s: str          # Symbol
+    U: int          # First update ID
+    u: int          # Final update ID
+    b: list         # Bids to be updated
+    a: list         # Asks to be updated
+
+class ExecutionReportMessage(TaggedEvent, tag="executionReport"):
+    E: int              # Event time
+    s: str              # Symbol
+    c: str              # Client order ID
+    S: str              # Side
+    o: str              # Order type
+    f: str              # Time in force
+    q: str              # Order quantity
+    p: str              # Order price
+    P: str              # Stop price
+    F: str              # Iceberg quantity
+    g: int              # Order list ID
+    C: str              # Original client order ID
+    x: str              # Current execution type
+    X: str              # Current order status
+    r: str              # Reject reason
+    i: int              # Order ID
+    l: str              # Last executed quantity
+    z: str              # Cumulative filled quantity
+    L: str              # Last executed price
+    n: str              # Commission amount
+    N: str | None       # Commission asset
+    T: int              # Transaction time
+    t: int              # Trade ID
+    w: bool             # Is the order on the book
+    m: bool             # Is this trade the maker side
+    O: int              # Order creation time
+    Z: str              # Cumulative quote asset transacted quantity
+    Y: str              # Last quote asset transacted quantity
+    Q: str              # Quote order quantity
+
+class AccountBalance(Struct, frozen=True, gc=False):
+    a: str          # Asset
+    f: str          # Free
+    l: str          # Locked
+
+class AccountPositionMessage(TaggedEvent, tag="outboundAccountPosition"):
+    E: int                      # Event time
+    u: int                      # Time of last account update
+    B: list[AccountBalance]     # Balances of the changed assets
+
+class BalanceUpdateMessage(TaggedEvent, tag="balanceUpdate"):
+    E: int          # Event time
+    a: str          # Asset
+    d: str          # Balance delta
+    T: int          # Clear time
+
+class ListStatusOrder(Struct, frozen=True, gc=False):
+    s: str          # Symbol
+    i: int          # Order ID
+    c: str          # Client order ID
+
+class ListStatusMessage(TaggedEvent, tag="listStatus"):
+    E: int                      # Event time
+    s: str                      # Symbol
+    g: int                      # Order list ID
+    c: str                      # Contingency type
+    l: str                      # List status type
+    L: str                      # List order status
+    r: str                      # List reject reason
+    C: str                      # List client order ID
+    T: int                      # Transaction time
+    O: list[ListStatusOrder]    # Orders in the list
+
+# Market events with an "e" tag
+MarketMessage = Union[KlineMessage, TradeMessage, AggTradeMessage, DepthUpdateMessage]
+# User data events, delivered on the listen key stream
+UserDataMessage = Union[ExecutionReportMessage, AccountPositionMessage, BalanceUpdateMessage, ListStatusMessage]
+# Every event that decodes straight into a schema through its "e" tag
+EventMessage = Union[MarketMessage, UserDataMessage]
+
+class CombinedEventMessage(Struct, frozen=True, gc=False):
+    stream: str             # Stream name
+    data: EventMessage      # Tagged event, decoded together with the envelope
+
+class CombinedBookTickerMessage(Struct, frozen=True, gc=False):
+    stream: str                 # Stream name
+    data: BookTickerMessage     # Untagged bookTicker payload, decoded together with the envelope
@@ -1,4 +1,5 @@
 import os
+import copy
 import json
 import time
 import uuid
@@ -6,15 +7,57 @@ import base64
 import logging
 import threading
 import ssl
+from collections import OrderedDict
 from queue import Queue, Empty
 from typing import Optional, Dict, Any, Callable
 import websocket
 from websocket import WebSocketConnectionClosedException, ABNF
 from cryptography.hazmat.primitives.asymmetric import ed25519
+from msgspec import DecodeError, json as msgspec_json
 
 # Import the centralized signature generator
 from binance_api.signature_utils import SignatureGenerator, KeyType
 
+# Kline interval lengths in seconds, used to align cache expiry with bar closes
+KLINE_INTERVAL_SECONDS = {
+    "1s": 1, "1m": 60, "3m": 180, "5m": 300, "15m": 900, "30m": 1800,
+    "1h": 3600, "2h": 7200, "4h": 14400, "6h": 21600, "8h": 28800, "12h": 43200,
+    "1d": 86400, "3d": 259200, "1w": 604800,
+}
+KLINE_CACHE_MAX_ENTRIES = 4096
+
+# Responses are decoded straight from the raw UTF-8 frame bytes
+_RESPONSE_DECODER = msgspec_json.Decoder()
+
+# REST-style OCO leg parameters mapped onto orderList.place.oco above/below legs
+OCO_SELL_LEG_ALIASES = {
+    "limitIcebergQty": "aboveIcebergQty",
+    "stopIcebergQty": "belowIcebergQty",
+    "limitClientOrderId": "aboveClientOrderId",
+    "stopClientOrderId": "belowClientOrderId",
+}
+OCO_BUY_LEG_ALIASES = {
+    "limitIcebergQty": "belowIcebergQty",
+    "stopIcebergQty": "aboveIcebergQty",
+    "limitClientOrderId": "belowClientOrderId",
+    "stopClientOrderId": "aboveClientOrderId",
+}
+
+# Optional orderList.place.oco parameters forwarded as-is
+# Reference: binance-spot-api-docs/web-socket-api.md lines 5112-5149
+OCO_OPTIONAL_PARAMS = (
+    # Order list level parameters
+    'listClientOrderId', 'newOrderRespType', 'selfTradePreventionMode', 'recvWindow',
+    # Above leg parameters
+    'aboveClientOrderId', 'aboveIcebergQty', 'aboveTrailingDelta',
+    'aboveStrategyId', 'aboveStrategyType',
+    'abovePegPriceType', 'abovePegOffsetType', 'abovePegOffsetValue',
+    # Below leg parameters
+    'belowClientOrderId', 'belowIcebergQty', 'belowTrailingDelta',
+    'belowStrategyId', 'belowStrategyType',
+    'belowPegPriceType', 'belowPegOffsetType', 'belowPegOffsetValue',
+)
+
 class BinanceWebSocketAPIClient:
     """
     Binance WebSocket API Client
@@ -373,8 +416,7 @@ class BinanceWebSocketAPIClient:
                 
                 # Handle different frame types
                 if op_code == ABNF.OPCODE_TEXT:
-                    message = frame.data.decode("utf-8")
-                    self._handle_message(message)
+                    self._handle_message(frame.data)
                 elif op_code == ABNF.OPCODE_BINARY:
                     self.logger.debug("Received binary frame")
                 elif op_code == ABNF.OPCODE_PING:
@@ -505,20 +547,21 @@ class BinanceWebSocketAPIClient:
         """
         return str(uuid.uuid4())
     
-    def _handle_message(self, message: str):
+    def _handle_message(self, message):
         """
         Process incoming message from WebSocket
         
         Args:
-            message: JSON message received from server
+            message: JSON message received from server, as raw bytes or str
         """
         try:
             # Parse message
-            data = json.loads(message)
+            data = _RESPONSE_DECODER.decode(message)
             request_id = data.get('id')
             
-            # Debug raw message
-            self.logger.debug(f"Received message: {message[:200]}...")
+            # Debug raw message (slicing is skipped unless debug logging is on)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Received message: %s...", message[:200])
             
             # Log error responses
             if 'error' in data:
@@ -561,12 +604,12 @@ class BinanceWebSocketAPIClient:
                     except Exception as cb_err:
                         self.logger.error(f"Event callback failed: {cb_err}")
                 else:
-                    self.logger.debug(f"Received event without handler: {data}")
+                    self.logger.debug("Received event without handler: %s", data)
             else:
-                self.logger.debug(f"Unhandled message: {message[:200]}...")
+                self.logger.debug("Unhandled message: %.200s...", message)
                 
-        except json.JSONDecodeError:
-            self.logger.error(f"Failed to parse message as JSON: {message[:200]}...")
+        except DecodeError:
+            self.logger.error("Failed to parse message as JSON: %.200s...", message)
         except Exception as e:
             self.logger.error(f"Error handling message: {e}, message: {message[:200]}...")
     
@@ -597,7 +640,7 @@ class BinanceWebSocketAPIClient:
         
         # Send request
         request_json = json.dumps(request)
-        self.logger.debug(f"Sending raw request: {request_json[:200]}...")
+        self.logger.debug("Sending raw request: %.200s...", request_json)
         
         try:
             with self.lock:
@@ -651,7 +694,7 @@ class BinanceWebSocketAPIClient:
         
         # Send request
         request_json = json.dumps(request)
-        self.logger.debug(f"Sending request: {request_json[:200]}...")
+        self.logger.debug("Sending request: %.200s...", request_json)
         try:
             with self.lock:
                 if self.ws and self.ws_connected:
@@ -751,7 +794,7 @@ class BinanceWebSocketAPIClient:
             sorted_params = sorted((k, v) for k, v in params.items() if k != 'signature')
             query_string = '&'.join([f"{k}={v}" for k, v in sorted_params])
             signature, key_type = sig_gen.generate_signature(query_string)
-            self.logger.debug(f"Generated {key_type.value.upper()} signature for query: {query_string[:50]}...")
+            self.logger.debug("Generated %s signature for query: %.50s...", key_type.value.upper(), query_string)
             return signature
         except Exception as e:
             self.logger.error(f"Signature generation failed: {e}")
@@ -975,6 +1018,9 @@ class BinanceWSClient:
             event_callback=event_callback
         )
         self.logger = logging.getLogger(__name__)
+        # LRU cache of kline responses: key -> (response, expires_at or None for immutable)
+        self._kline_cache = OrderedDict()
+        self._kline_cache_lock = threading.Lock()
     
     def check_connectivity(self, timeout=20):
         """Test WebSocket API connectivity"""
@@ -1029,14 +1075,7 @@ class BinanceWSClient:
                 params["abovePrice"] = str(price)
 
                 # Map REST-style parameters for SELL (Limit is Above, Stop is Below)
-                if "limitIcebergQty" in kwargs:
-                    params["aboveIcebergQty"] = kwargs.pop("limitIcebergQty")
-                if "stopIcebergQty" in kwargs:
-                    params["belowIcebergQty"] = kwargs.pop("stopIcebergQty")
-                if "limitClientOrderId" in kwargs:
-                    params["aboveClientOrderId"] = kwargs.pop("limitClientOrderId")
-                if "stopClientOrderId" in kwargs:
-                    params["belowClientOrderId"] = kwargs.pop("stopClientOrderId")
+                leg_aliases = OCO_SELL_LEG_ALIASES
 
                 if stopLimitPrice:
                     params["belowType"] = belowType or "STOP_LOSS_LIMIT"
@@ -1061,37 +1100,20 @@ class BinanceWSClient:
                 params["belowPrice"] = str(price)
 
                 # Map REST-style parameters for BUY (Limit is Below, Stop is Above)
-                if "limitIcebergQty" in kwargs:
-                    params["belowIcebergQty"] = kwargs.pop("limitIcebergQty")
-                if "stopIcebergQty" in kwargs:
-                    params["aboveIcebergQty"] = kwargs.pop("stopIcebergQty")
-                if "limitClientOrderId" in kwargs:
-                    params["belowClientOrderId"] = kwargs.pop("limitClientOrderId")
-                if "stopClientOrderId" in kwargs:
-                    params["aboveClientOrderId"] = kwargs.pop("stopClientOrderId")
+                leg_aliases = OCO_BUY_LEG_ALIASES
+
+            for rest_name, ws_name in leg_aliases.items():
+                if rest_name in kwargs:
+                    params[ws_name] = kwargs[rest_name]
             
             # Log the parameters for debugging
-            self.logger.debug(f"Sending OCO order via WebSocket: {params}")
+            self.logger.debug("Sending OCO order via WebSocket: %s", params)
             
             # Forward all optional parameters from **kwargs to support advanced features
-            # Reference: binance-spot-api-docs/web-socket-api.md lines 5112-5149
-            optional_params = [
-                # Order list level parameters
-                'listClientOrderId', 'newOrderRespType', 'selfTradePreventionMode', 'recvWindow',
-                # Above leg parameters
-                'aboveClientOrderId', 'aboveIcebergQty', 'aboveTrailingDelta',
-                'aboveStrategyId', 'aboveStrategyType',
-                'abovePegPriceType', 'abovePegOffsetType', 'abovePegOffsetValue',
-                # Below leg parameters
-                'belowClientOrderId', 'belowIcebergQty', 'belowTrailingDelta',
-                'belowStrategyId', 'belowStrategyType',
-                'belowPegPriceType', 'belowPegOffsetType', 'belowPegOffsetValue'
-            ]
-            
-            # Add any optional parameters that were provided
-            for param in optional_params:
-                if param in kwargs and kwargs[param] is not None:
-                    params[param] = kwargs[param]
+            for param in OCO_OPTIONAL_PARAMS:
+                value = kwargs.get(param)
+                if value is not None:
+                    params[param] = value
             
             # Send the request using the orderList.place.oco endpoint
             request_id = self.client._send_signed_request("orderList.place.oco", params)
@@ -1132,14 +1154,59 @@ class BinanceWSClient:
         return self.client._wait_for_response(request_id)
 
     def klines(self, symbol, interval, startTime=None, endTime=None, limit=500):
-        """Get kline data via WS API."""
+        """
+        Get kline data via WS API.
+
+        Responses are cached in memory: windows that ended in the past are
+        immutable and kept until evicted, while windows reaching the live bar
+        expire at the next close of the requested interval. Every caller gets
+        its own copy, so mutating a response cannot corrupt the cache.
+        """
+        cache_key = (symbol, interval, startTime, endTime, limit)
+        now = time.time()
+        with self._kline_cache_lock:
+            entry = self._kline_cache.get(cache_key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at is None or now < expires_at:
+                    self._kline_cache.move_to_end(cache_key)
+                    return copy.deepcopy(response)
+                del self._kline_cache[cache_key]
+
         params = {"symbol": symbol, "interval": interval, "limit": limit}
         if startTime is not None:
             params["startTime"] = startTime
         if endTime is not None:
             params["endTime"] = endTime
         request_id = self.client._send_request("klines", params)
-        return self.client._wait_for_response(request_id)
+        response = self.client._wait_for_response(request_id)
+
+        if response and response.get("status") == 200:
+            expires_at = self._kline_cache_expiry(interval, endTime, now)
+            if expires_at is None or expires_at > now:
+                with self._kline_cache_lock:
+                    self._kline_cache[cache_key] = (copy.deepcopy(response), expires_at)
+                    self._kline_cache.move_to_end(cache_key)
+                    while len(self._kline_cache) > KLINE_CACHE_MAX_ENTRIES:
+                        self._kline_cache.popitem(last=False)
+        return response
+
+    @staticmethod
+    def _kline_cache_expiry(interval, endTime, now):
+        """
+        Return the expiry timestamp (seconds) for a kline response.
+
+        None means the window is closed and the response never changes;
+        0 disables caching for intervals without a fixed length (e.g. 1M).
+        """
+        interval_seconds = KLINE_INTERVAL_SECONDS.get(interval)
+        if not interval_seconds:
+            return 0
+        # A window ending before the current bar opened can no longer change
+        current_bar_open = now - (now % interval_seconds)
+        if endTime is not None and endTime / 1000 < current_bar_open:
+            return None
+        return current_bar_open + interval_seconds
 
     def account(self, omitZeroBalances=None, recvWindow=None, **kwargs):
         """
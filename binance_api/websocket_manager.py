@@ -1,107 +1,98 @@
-import time
+import sys
+import asyncio
 import logging
+import threading
+import time
+from collections import deque
+from binance.websocket.binance_socket_manager import BinanceSocketManager
 from binance.websocket.spot.websocket_stream import SpotWebsocketStreamClient
-from msgspec import Struct, json as msgspec_json
-
-# Define message schemas for fast parsing of market data streams
-class KlineData(Struct):
-    t: int          # Kline start time
-    T: int          # Kline close time
-    s: str          # Symbol
-    i: str          # Interval
-    f: int          # First trade ID
-    L: int          # Last trade ID
-    o: str          # Open price
-    c: str          # Close price
-    h: str          # High price
-    l: str          # Low price
-    v: str          # Volume
-    n: int          # Number of trades
-    x: bool         # Is closed
-    q: str          # Quote volume
-    V: str          # Taker buy volume
-    Q: str          # Taker buy quote volume
-    B: str          # Ignore
+from websocket import ABNF, WebSocketException, create_connection
+from msgspec import DecodeError, ValidationError, json as msgspec_json
+from binance_api.schemas import (
+    BookTickerMessage, CombinedBookTickerMessage, CombinedEventMessage, EventMessage,
+)
 
-class KlineMessage(Struct):
-    e: str          # Event type
-    E: int          # Event time
-    s: str          # Symbol
-    k: KlineData    # Kline data
+# uvloop gives the decode loop a faster event loop where it is available
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    # Fallback to the stock asyncio event loop (e.g. on Windows)
+    UVLOOP_AVAILABLE = False
 
-class TradeMessage(Struct):
-    e: str          # Event type
-    E: int          # Event time
-    s: str          # Symbol
-    t: int          # Trade ID
-    p: str          # Price
-    q: str          # Quantity
-    b: int          # Buyer order ID
-    a: int          # Seller order ID
-    T: int          # Trade time
-    m: bool         # Is buyer market maker
-    M: bool         # Ignore
+# Pre-built decoders; the tagged Union dispatches on "e" inside msgspec
+_EVENT_DECODER = msgspec_json.Decoder(EventMessage)
+_BOOK_TICKER_DECODER = msgspec_json.Decoder(BookTickerMessage)
+_COMBINED_EVENT_DECODER = msgspec_json.Decoder(CombinedEventMessage)
+_COMBINED_BOOK_TICKER_DECODER = msgspec_json.Decoder(CombinedBookTickerMessage)
+_GENERIC_DECODER = msgspec_json.Decoder()
 
-class AggTradeMessage(Struct):
-    e: str          # Event type
-    E: int          # Event time
-    s: str          # Symbol
-    a: int          # Aggregate trade ID
-    p: str          # Price
-    q: str          # Quantity
-    f: int          # First trade ID
-    l: int          # Last trade ID
-    T: int          # Trade time
-    m: bool         # Is buyer market maker
-    M: bool         # Ignore
+_COMBINED_PREFIX = b'{"stream":'
+# bookTicker payloads carry no "e" tag, so they get their own typed envelope
+_BOOK_TICKER_STREAM = b'@bookTicker"'
+_EVENT_TAG = b'"e":"'
+# Raw bookTicker payloads always open with their update id
+_BOOK_TICKER_PREFIX = b'{"u":'
 
-class BookTickerMessage(Struct, kw_only=True):
-    u: int | None = None  # Update ID, optional with default None
-    s: str                # Symbol
-    b: str                # Best bid price
-    B: str                # Best bid quantity
-    a: str                # Best ask price
-    A: str                # Best ask quantity
 
-class DepthUpdateMessage(Struct):
-    e: str          # Event type
-    E: int          # Event time
-    s: str          # Symbol
-    U: int          # First update ID
-    u: int          # Final update ID
-    b: list         # Bids to be updated
-    a: list         # Asks to be updated
-
-class CombinedStreamMessage(Struct):
-    stream: str     # Stream name
-    data: object    # Data payload
-
-class UserDataMessage(Struct):
-    e: str          # Event type (outboundAccountPosition, executionReport, etc.)
-    E: int          # Event time
-    # All other fields are dynamic and will be passed through
+class BytesSocketManager(BinanceSocketManager):
+    """Socket manager that hands text frames to on_message as raw UTF-8 bytes"""
+    
+    def create_ws_connection(self):
+        # msgspec rejects invalid UTF-8 while decoding, so skip websocket-client's
+        # pure-Python validation of every text frame
+        self.ws = create_connection(
+            self.stream_url, timeout=self.timeout, skip_utf8_validation=True, **self._proxy_params
+        )
+        self.logger.debug("WebSocket connection has been established: %s", self.stream_url)
+        self._callback(self.on_open)
+    
+    def _handle_data(self, op_code, frame, data):
+        # msgspec decodes bytes directly, so skip the connector's str conversion
+        if op_code == ABNF.OPCODE_TEXT:
+            self._callback(self.on_message, frame.data)
+    
+    def _callback(self, callback, *args):
+        # read_data exits after reporting a read failure but keeps reading after a
+        # callback error, so remember which errors came from callbacks
+        if callback:
+            try:
+                callback(self, *args)
+            except Exception as e:
+                self.logger.error("Error from callback %s: %s", callback, e)
+                self.callback_error = e
+                self._handle_exception(e)
 
-class StandardizedMessage:
-    def __init__(self, data):
-        for key, value in data.items():
-            # Handle nested dictionaries by recursively standardizing
-            if isinstance(value, dict):
-                value = StandardizedMessage(value)
-            setattr(self, key, value)
-    
-    def get(self, key, default=None):
-        """Implement dictionary-like get method for compatibility"""
-        return getattr(self, key, default)
-    
-    # Add additional dictionary-like methods for better compatibility
-    def __getitem__(self, key):
+class ReconnectableStreamClient(SpotWebsocketStreamClient):
+    """
+    Stream client that can redial its socket in place
+    
+    The connector runs each connection on a one-shot reader thread, so a new
+    socket manager is still needed per connection. Keeping the client object
+    itself alive lets reconnects reuse the captured settings and callbacks
+    instead of rebuilding the whole client on every retry.
+    """
+    
+    def _initialize_socket(self, *args):
+        self._socket_args = args
+        return BytesSocketManager(*args)
+    
+    def reconnect(self):
+        """Close the current socket (if still open) and start a fresh one"""
+        old_manager = self.socket_manager
+        # Errors the old reader reports while shutting down no longer concern the stream
+        old_manager.retired = True
         try:
-            return getattr(self, key)
-        except AttributeError:
-            raise KeyError(key)
-            
-    def __contains__(self, key):
-        return hasattr(self, key)
+            if old_manager.ws.connected:
+                old_manager.close()
+        except Exception:
+            pass
+        # Reconnects usually run on the old reader thread via the error callback
+        if old_manager is not threading.current_thread():
+            old_manager.join(timeout=5)
+        
+        self.socket_manager = self._initialize_socket(*self._socket_args)
+        self.socket_manager.start()
 
 class MarketDataWebsocketManager:
     """
@@ -110,8 +101,32 @@ class MarketDataWebsocketManager:
     This class manages WebSocket connections to Binance market data streams only.
     It does NOT handle WebSocket API functionality, which is managed separately
     by the WebSocketAPIClient class.
+    
+    Frames are decoded and dispatched on a private event loop thread, which
+    runs on uvloop when it is installed; main.py also sets the uvloop policy
+    for the rest of the process.
     """
     
+    # Key sets used to classify decoded payloads with a single C-level set test
+    _CONTROL_KEYS = frozenset({'result', 'id'})  # SUBSCRIBE/UNSUBSCRIBE acknowledgements
+    # Raw prefixes of SUBSCRIBE acknowledgements, checked before any JSON decode.
+    # Ping/pong are WebSocket control frames answered by the stream client itself.
+    _CONTROL_PREFIXES = (b'{"result":', b'{"id":')
+    # Market data frames buffered between the socket thread and the decode loop; the oldest
+    # are dropped when full. User data frames are buffered separately and never dropped.
+    _QUEUE_MAXSIZE = 4096
+    # Frames processed per decode loop callback before yielding back to the loop
+    _DRAIN_BATCH = 64
+    # Minimum seconds between warnings about dropped market data frames
+    _DROP_LOG_INTERVAL = 10
+    # start_multiple_streams names -> (subscription container, stream name suffix, dict value or None for sets)
+    _STREAM_TABLE = {
+        'depth': ('depth_speeds', '@depth@100ms', 100),  # Default to 100ms
+        'trade': ('trade_symbols', '@trade', None),
+        'bookticker': ('bookticker_symbols', '@bookTicker', None),
+        'aggtrade': ('aggtrade_symbols', '@aggTrade', None),
+    }
+    
     def __init__(self, on_message_callback, on_error_callback=None, use_testnet=False):
         """
         Initialize the WebSocket manager for market data streams
@@ -127,34 +142,45 @@ class MarketDataWebsocketManager:
         self.logger = logging.getLogger(__name__)
         self.reconnect_delay = 5
         self.is_running = False
+        self._stop_event = threading.Event()  # Set by stop() so pending reconnects are abandoned
+        self._reconnect_lock = threading.Lock()
+        self._reconnect_timer = None  # Pending backoff timer, at most one at a time
         self.symbols = set()  # Track subscribed symbols
-        self.stream_types = {}  # Track types of streams for each symbol
+        self._stream_keys = {}  # symbol -> interned lowercase stream key
+        self._stream_names = None  # Cached stream names, rebuilt after subscription changes
+        # Subscribed streams, one container per stream type, keyed by lowercase symbol
+        self.kline_intervals = {}  # symbol -> kline interval
+        self.depth_speeds = {}  # symbol -> depth update speed (ms)
+        self.trade_symbols = set()
+        self.bookticker_symbols = set()
+        self.aggtrade_symbols = set()
         self.listen_key = None
         self.max_reconnect_attempts = 10
         self.current_reconnect_attempt = 0
         self.use_testnet = use_testnet
+        # Decode loop that takes parsing and dispatch off the socket thread
+        self._loop = None
+        self._pending = deque()  # Market data frames, kept to _QUEUE_MAXSIZE by _message_handler
+        self._pending_user = deque()  # Listen key frames (order fills), unbounded
+        self._user_stream_prefix = None  # Combined envelope prefix of listen key frames
+        self.dropped_frames = 0  # Market data frames dropped because the decode loop fell behind
+        self._logged_drops = 0  # dropped_frames at the last drop warning
+        self._last_drop_log = None  # time.monotonic() of the last drop warning
+        self._drain_scheduled = False
+        self._loop_thread = None
         
         # Set stream URL based on network
         if self.use_testnet:
             self.stream_url = "wss://stream.testnet.binance.vision"
         else:
             self.stream_url = "wss://stream.binance.com:9443"
-        
-        # Initialize message handlers mapping
-        self.message_handlers = {
-            'kline': self._handle_kline_message,
-            'trade': self._handle_trade_message,
-            'aggTrade': self._handle_aggtrade_message,
-            'depthUpdate': self._handle_depth_message,
-            'outboundAccountPosition': self._handle_account_update,
-            'executionReport': self._handle_order_update,
-            'listStatus': self._handle_oco_update,
-            'balanceUpdate': self._handle_balance_update
-        }
     
     def _message_handler(self, _, message):
         """
-        Process incoming WebSocket messages
+        Receive a WebSocket frame on the socket thread
+        
+        Frames are handed to the decode loop so the socket thread can keep
+        draining the connection; without a running loop they are processed inline.
         
         Args:
             _: WebSocket client instance (unused)
@@ -162,6 +188,91 @@ class MarketDataWebsocketManager:
         """
         if not message:
             return
+        
+        loop = self._loop
+        if loop is None:
+            self._process_message(message)
+            return
+        
+        if isinstance(message, str):
+            # Fallback for clients that deliver already-decoded text frames
+            message = message.encode()
+        
+        prefix = self._user_stream_prefix
+        if prefix is not None and message.startswith(prefix):
+            # A lost fill would leave the grid without its counter-order, so user data is never dropped
+            self._pending_user.append(message)
+        else:
+            pending = self._pending
+            if len(pending) >= self._QUEUE_MAXSIZE:
+                # Stale market data is worth less than fresh data, so a full buffer drops its oldest frame
+                try:
+                    pending.popleft()
+                except IndexError:
+                    pass  # Drained meanwhile, nothing dropped
+                else:
+                    # Only counted here; the decode loop reports drops so an overload does not also flood the log
+                    self.dropped_frames += 1
+            pending.append(message)
+        # Wake the decode loop once per burst rather than once per frame
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            loop.call_soon_threadsafe(self._drain_messages)
+    
+    def _drain_messages(self):
+        """Decode and dispatch buffered frames in batches on the decode loop, user data first"""
+        # Cleared before draining, so frames appended meanwhile schedule another pass
+        self._drain_scheduled = False
+        pending_user = self._pending_user
+        pending = self._pending
+        for _ in range(self._DRAIN_BATCH):
+            if pending_user:
+                message = pending_user.popleft()
+            elif pending:
+                message = pending.popleft()
+            else:
+                break
+            try:
+                self._process_message(message)
+            except Exception as e:
+                self.logger.error("Error processing message: %s", e)
+        
+        if self.dropped_frames != self._logged_drops:
+            self._log_dropped_frames()
+        
+        if (pending_user or pending) and not self._drain_scheduled:
+            # Yield to the loop between batches so stop() is not held up by a backlog
+            self._drain_scheduled = True
+            asyncio.get_running_loop().call_soon(self._drain_messages)
+    
+    def _log_dropped_frames(self):
+        """Warn about dropped market data frames when dropping starts, then at most once per _DROP_LOG_INTERVAL"""
+        now = time.monotonic()
+        if self._last_drop_log is not None and now - self._last_drop_log < self._DROP_LOG_INTERVAL:
+            return
+        
+        dropped = self.dropped_frames
+        self.logger.warning(
+            "Decode buffer full, dropped %s oldest market data frames (%s dropped in total)",
+            dropped - self._logged_drops, dropped
+        )
+        self._logged_drops = dropped
+        self._last_drop_log = now
+    
+    def _process_message(self, message):
+        """
+        Process incoming WebSocket messages
+        
+        Args:
+            message: The received message
+        """
+        if isinstance(message, str):
+            # Fallback for clients that deliver already-decoded text frames
+            message = message.encode()
+        
+        # Skip subscription acknowledgements without paying for a decode
+        if message.startswith(self._CONTROL_PREFIXES):
+            return
             
         parsed_message = self._parse_message_safely(message)
         if parsed_message:
@@ -172,239 +283,251 @@ class MarketDataWebsocketManager:
         Safely parse a message from the WebSocket
         
         Args:
-            message: Raw message to parse
+            message: Raw UTF-8 JSON frame (bytes)
             
         Returns:
             Parsed message object or None if parsing failed
         """
         try:
-            # Handle string messages
-            if isinstance(message, str):
-                # Parse as generic JSON first
-                generic_msg = msgspec_json.decode(message)
-                
-                # Handle combined stream format
-                if isinstance(generic_msg, dict) and 'stream' in generic_msg and 'data' in generic_msg:
-                    # Process the combined stream format
-                    combined_msg = CombinedStreamMessage(
-                        stream=generic_msg['stream'], 
-                        data=generic_msg['data']
-                    )
-                    # Return a tuple indicating this is a combined message
-                    return ('combined', combined_msg)
-                    
-                return generic_msg
-            else:
-                # Already parsed message or non-string input
-                return message
+            # Combined stream envelope: only its payload is delivered downstream
+            if message.startswith(_COMBINED_PREFIX):
+                # Known payloads decode together with their envelope in a single pass
+                if message.find(_BOOK_TICKER_STREAM, 0, 64) < 0:
+                    decoder = _COMBINED_EVENT_DECODER
+                else:
+                    decoder = _COMBINED_BOOK_TICKER_DECODER
+                try:
+                    return decoder.decode(message).data
+                except ValidationError as decode_error:
+                    # Unknown event or schema mismatch: a single generic pass over the whole frame
+                    self.logger.debug("Schema parsing failed: %s, using generic parsing", decode_error)
+                    return _GENERIC_DECODER.decode(message).get('data')
+            
+            return self._decode_payload(message)
                 
-        except Exception as e:
-            self.logger.debug(f"Message parsing failed: {e}")
-            if isinstance(message, str) and len(message) < 1000:
-                self.logger.debug(f"Raw message: {message}")
+        except DecodeError as e:
+            # Checked per failure rather than cached, so runtime log level changes apply
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Message parsing failed: %s", e)
+                if len(message) < 1000:
+                    self.logger.debug("Raw message: %s", message)
             return None
     
-    def _route_message_to_handler(self, parsed_message):
+    def _decode_payload(self, payload):
         """
-        Route parsed message to appropriate handler based on message type
+        Decode a single stream payload straight into its schema
+        
+        Known market and user data events are decoded in one pass through the
+        tagged Union, without an intermediate dict. bookTicker updates are
+        recognised by their leading update id; anything else falls back to a dict.
         
         Args:
-            parsed_message: Parsed message object
-        """
-        try:
-            # Handle combined stream messages
-            if isinstance(parsed_message, tuple) and parsed_message[0] == 'combined':
-                combined_msg = parsed_message[1]
-                # Pass the combined message to callback
-                self.on_message_callback(combined_msg)
-                
-                # Also process the inner data
-                inner_data = combined_msg.data
-                self._route_message_to_handler(inner_data)
-                return
-                
-            # Handle regular messages with event types
-            if isinstance(parsed_message, dict) and 'e' in parsed_message:
-                event_type = parsed_message['e']
-                
-                # Use mapped handler for the event type
-                handler = self.message_handlers.get(event_type)
-                if handler:
-                    handler(parsed_message)
-                else:
-                    # Unknown event type, standardize and pass through
-                    self.on_message_callback(self._standardize_message(parsed_message))
-                return
-                
-            # Handle bookTicker format which doesn't have 'e' field
-            if isinstance(parsed_message, dict) and all(key in parsed_message for key in ['s', 'b', 'B', 'a', 'A']):
-                self._handle_bookticker_message(parsed_message)
-                return
-                
-            # Default: pass the message as is
-            self.on_message_callback(parsed_message)
+            payload: Raw UTF-8 JSON payload (bytes)
             
-        except Exception as e:
-            self.logger.error(f"Error routing message: {e}")
-            # Still try to deliver the message to make sure client receives something
+        Returns:
+            Typed Struct, or a plain dict for payloads without a schema
+        """
+        head = payload[:64]
+        # bookTicker is the highest-rate stream and the only one without an "e" field;
+        # its leading "u" key identifies it without scanning for an event tag
+        if head.startswith(_BOOK_TICKER_PREFIX):
             try:
-                self.on_message_callback(parsed_message)
-            except:
-                pass
+                return _BOOK_TICKER_DECODER.decode(payload)
+            except ValidationError:
+                return _GENERIC_DECODER.decode(payload)
+        
+        if _EVENT_TAG not in head:
+            # Neither a bookTicker nor a tagged event, so there is no schema to try
+            return _GENERIC_DECODER.decode(payload)
+        
+        try:
+            return _EVENT_DECODER.decode(payload)
+        except ValidationError as decode_error:
+            self.logger.debug("Schema parsing failed: %s, using generic parsing", decode_error)
+        return _GENERIC_DECODER.decode(payload)
     
-    def _standardize_message(self, message_dict):
+    def _route_message_to_handler(self, parsed_message):
         """
-        Standardize message format for consistent handling at higher levels
+        Route parsed message to appropriate handler based on message type
         
         Args:
-            message_dict: Raw dictionary message
-            
-        Returns:
-            Standardized message object with consistent attribute access
+            parsed_message: Parsed message object
         """
-        # Convert all dictionary keys to attributes for consistent access
-        # This helps main.py to use consistent dot notation regardless of message source
-        return StandardizedMessage(message_dict)
-    
-    # Individual message type handlers
-    
-    def _handle_kline_message(self, message):
-        """Handle kline/candlestick messages"""
         try:
-            # Parse with schema for validation and standardization
-            parsed = KlineMessage(**message)
-            self.on_message_callback(parsed)
-        except Exception:
-            # Fallback to standardized message
-            self.on_message_callback(self._standardize_message(message))
-    
-    def _handle_trade_message(self, message):
-        """Handle trade messages"""
-        try:
-            parsed = TradeMessage(**message)
-            self.on_message_callback(parsed)
-        except Exception:
-            self.on_message_callback(self._standardize_message(message))
-    
-    def _handle_aggtrade_message(self, message):
-        """Handle aggregate trade messages"""
-        try:
-            parsed = AggTradeMessage(**message)
-            self.on_message_callback(parsed)
-        except Exception:
-            self.on_message_callback(self._standardize_message(message))
-    
-    def _handle_depth_message(self, message):
-        """Handle order book depth update messages"""
-        try:
-            parsed = DepthUpdateMessage(**message)
-            self.on_message_callback(parsed)
-        except Exception:
-            self.on_message_callback(self._standardize_message(message))
-    
-    def _handle_bookticker_message(self, message):
-        """Handle book ticker messages"""
-        try:
-            parsed = BookTickerMessage(**message)
-            self.on_message_callback(parsed)
-        except Exception:
-            self.on_message_callback(self._standardize_message(message))
-    
-    def _handle_account_update(self, message):
-        """Handle account update messages"""
-        self.on_message_callback(self._standardize_message(message))
-    
-    def _handle_order_update(self, message):
-        """Handle order update messages"""
-        self.on_message_callback(self._standardize_message(message))
-    
-    def _handle_oco_update(self, message):
-        """Handle OCO order update messages"""
-        self.on_message_callback(self._standardize_message(message))
-    
-    def _handle_balance_update(self, message):
-        """Handle balance update messages"""
-        self.on_message_callback(self._standardize_message(message))
+            # Typed Structs go straight to the callback, which dispatches on type(message);
+            # only the rare dict fallback needs to be checked for acknowledgements
+            if (type(parsed_message) is dict and 'e' not in parsed_message
+                    and not self._CONTROL_KEYS.isdisjoint(parsed_message)):
+                return
+            
+            # Typed events are delivered as decoded, unknown events as plain dicts
+            self.on_message_callback(parsed_message)
+            
+        except (ValidationError, TypeError) as e:
+            # Log and drop; the callback has either run once already or must not see a broken message
+            self.logger.error("Error routing message: %s", e)
     
-    def _error_handler(self, _, error):
+    def _error_handler(self, socket_manager, error):
         """
         Handle WebSocket errors
         
         Args:
-            _: WebSocket client instance (unused)
+            socket_manager: Socket manager that reported the error
             error: The error that occurred
         """
-        self.logger.error(f"Market Data WebSocket error: {error}")
+        client = self.ws_client
+        if getattr(socket_manager, 'retired', False) or (
+                client is not None and client.socket_manager is not socket_manager):
+            # Reported by a reader that a reconnect or stop() has already replaced
+            self.logger.debug("Ignoring error from a replaced socket: %s", error)
+            return
+        
+        self.logger.error("Market Data WebSocket error: %s", error)
         
         if self.on_error_callback:
             self.on_error_callback(error)
         
+        if self._is_transient_error(socket_manager, error):
+            # The connection survived, so refresh subscriptions without a new handshake
+            try:
+                self._reconnect_streams(redial=False)
+                return
+            except Exception as e:
+                self.logger.error("Failed to resubscribe streams: %s", e)
+        
         # Try to reconnect
         self._try_reconnect()
     
-    def _try_reconnect(self):
-        """Attempt to reconnect WebSocket with exponential backoff"""
-        if not self.is_running:
-            return
+    @staticmethod
+    def _is_transient_error(socket_manager, error):
+        """
+        Check whether an error left the underlying connection usable
+        
+        Errors raised while handling a single frame are reported through the
+        same callback as transport failures, but only they leave the reader
+        running; after a read failure the reader thread has exited, even if
+        the socket still looks connected.
+        
+        Args:
+            socket_manager: Socket manager that reported the error
+            error: The error that occurred
             
-        if self.current_reconnect_attempt >= self.max_reconnect_attempts:
-            self.logger.error(f"Maximum reconnection attempts ({self.max_reconnect_attempts}) reached. Giving up.")
-            return
+        Returns:
+            bool: True if the reader is still running on an open connection
+        """
+        if isinstance(error, (WebSocketException, OSError)):
+            return False
+        if getattr(socket_manager, 'callback_error', None) is not error:
+            return False  # Raised by the read loop itself, which has stopped
+        ws = getattr(socket_manager, 'ws', None)
+        return bool(ws is not None and ws.connected)
+    
+    def _try_reconnect(self):
+        """
+        Schedule a reconnect attempt with exponential backoff
+        
+        The backoff runs on a timer thread, so the calling socket thread is
+        released immediately. Errors reported while an attempt is pending do
+        not schedule another one.
+        """
+        with self._reconnect_lock:
+            if not self.is_running or self._stop_event.is_set() or self._reconnect_timer is not None:
+                return
             
-        self.current_reconnect_attempt += 1
-        backoff_time = min(60, self.reconnect_delay * (2 ** (self.current_reconnect_attempt - 1)))
-        self.logger.info(f"Attempting to reconnect ({self.current_reconnect_attempt}/{self.max_reconnect_attempts}) in {backoff_time} seconds...")
-        time.sleep(backoff_time)
+            if self.current_reconnect_attempt >= self.max_reconnect_attempts:
+                self.logger.error("Maximum reconnection attempts (%s) reached. Giving up.", self.max_reconnect_attempts)
+                return
+                
+            self.current_reconnect_attempt += 1
+            backoff_time = min(60, self.reconnect_delay * (2 ** (self.current_reconnect_attempt - 1)))
+            self.logger.info("Attempting to reconnect (%s/%s) in %s seconds...", self.current_reconnect_attempt, self.max_reconnect_attempts, backoff_time)
+            timer = threading.Timer(backoff_time, self._do_reconnect)
+            timer.daemon = True
+            self._reconnect_timer = timer
+        timer.start()
+    
+    def _do_reconnect(self):
+        """Run a scheduled reconnect attempt, scheduling the next one if it fails"""
+        with self._reconnect_lock:
+            self._reconnect_timer = None
+        if not self.is_running or self._stop_event.is_set():
+            return  # Stopped during backoff
         
         try:
-            self.stop()
-            
-            # Recreate necessary WebSocket streams
+            # Redial and recreate the previously subscribed streams
             self._reconnect_streams()
-            
-            self.logger.info("Market Data WebSocket reconnected successfully")
-            self.current_reconnect_attempt = 0  # Reset counter on successful reconnect
         except Exception as e:
-            self.logger.error(f"Failed to reconnect: {e}")
-            self._try_reconnect()  # Try again
+            self.logger.error("Failed to reconnect: %s", e)
+            self._try_reconnect()  # Try again with a longer backoff
+            return
+        
+        self.logger.info("Market Data WebSocket reconnected successfully")
+        self.current_reconnect_attempt = 0  # Reset counter on successful reconnect
     
-    def _reconnect_streams(self):
-        """Reconnect all previously subscribed streams"""
-        if not self.symbols:
-            return  # No streams to reconnect
+    def _reconnect_streams(self, redial=True):
+        """
+        Reconnect all previously subscribed streams
         
-        # Create a new client
-        self.ws_client = SpotWebsocketStreamClient(
-            stream_url=self.stream_url,
-            on_message=self._message_handler, 
-            on_error=self._error_handler,
-            is_combined=True  # Use combined streams
-        )
+        Args:
+            redial: Whether to open a new socket before resubscribing
+        """
+        if not self.symbols and not self.listen_key:
+            return  # No streams to reconnect
         
-        # Reconnect all previously subscribed streams
-        for symbol in self.symbols:
-            streams = self.stream_types.get(symbol, {})
-            
-            if 'kline' in streams:
-                interval = streams['kline']
-                self.ws_client.kline(symbol=symbol.lower(), interval=interval)
-                
-            if 'depth' in streams:
-                speed = streams['depth']
-                self.ws_client.diff_book_depth(symbol=symbol.lower(), speed=speed)
-                
-            if 'trade' in streams:
-                self.ws_client.trade(symbol=symbol.lower())
-                
-            if 'bookticker' in streams:
-                self.ws_client.book_ticker(symbol=symbol.lower())
-                
-            if 'aggtrade' in streams:
-                self.ws_client.agg_trade(symbol=symbol.lower())
+        # Reuse the existing client when possible, only redialing its socket
+        if not self.ws_client:
+            self._ensure_client_initialized()
+        elif redial:
+            self.ws_client.reconnect()
         
-        # Reconnect user data stream if needed
+        # Resubscribe everything, including the user data stream, in one SUBSCRIBE frame
+        stream_names = list(self._subscribed_stream_names())
         if self.listen_key:
-            self.ws_client.user_data(listen_key=self.listen_key)
+            stream_names.append(self.listen_key)
+        if stream_names:
+            self.ws_client.subscribe(stream_names)
+    
+    def _subscribed_stream_names(self):
+        """
+        Get the stream names of all tracked market data subscriptions
+        
+        The names are built once and reused by every reconnect until a
+        subscription changes.
+        
+        Returns:
+            tuple: Stream names as used by the combined stream endpoint
+        """
+        if self._stream_names is not None:
+            return self._stream_names
+        
+        stream_names = [f"{sym}@kline_{interval}" for sym, interval in self.kline_intervals.items()]
+        stream_names += [f"{sym}@depth@{speed}ms" for sym, speed in self.depth_speeds.items()]
+        stream_names += [f"{sym}@trade" for sym in self.trade_symbols]
+        stream_names += [f"{sym}@bookTicker" for sym in self.bookticker_symbols]
+        stream_names += [f"{sym}@aggTrade" for sym in self.aggtrade_symbols]
+        self._stream_names = tuple(stream_names)
+        return self._stream_names
+    
+    def _track_symbol(self, symbol):
+        """
+        Record a subscribed symbol, interning it so later set and dict lookups are cheap
+        
+        Args:
+            symbol: Symbol as passed by the caller
+            
+        Returns:
+            str: Interned lowercase symbol used as the stream key
+        """
+        # A subscription is about to change, so the cached stream names are stale
+        self._stream_names = None
+        
+        # Known symbols cost a single lookup when more streams are added for them
+        sym = self._stream_keys.get(symbol)
+        if sym is None:
+            symbol = sys.intern(symbol)
+            sym = self._stream_keys[symbol] = sys.intern(symbol.lower())
+            self.symbols.add(symbol)
+        return sym
     
     def start_kline_stream(self, symbol, interval='1m'):
         """
@@ -415,14 +538,10 @@ class MarketDataWebsocketManager:
             interval: Kline interval (default: 1m)
         """
         self._ensure_client_initialized()
-        self.symbols.add(symbol)
-        
-        if symbol not in self.stream_types:
-            self.stream_types[symbol] = {}
-        
-        self.stream_types[symbol]['kline'] = interval
-        self.ws_client.kline(symbol=symbol.lower(), interval=interval)
-        self.logger.info(f"Started kline stream for {symbol} with {interval} interval")
+        sym = self._track_symbol(symbol)
+        self.kline_intervals[sym] = interval
+        self.ws_client.kline(symbol=sym, interval=interval)
+        self.logger.info("Started kline stream for %s with %s interval", symbol, interval)
     
     def start_depth_stream(self, symbol, speed=100):
         """
@@ -433,14 +552,10 @@ class MarketDataWebsocketManager:
             speed: Update speed in ms (100 or 1000)
         """
         self._ensure_client_initialized()
-        self.symbols.add(symbol)
-        
-        if symbol not in self.stream_types:
-            self.stream_types[symbol] = {}
-        
-        self.stream_types[symbol]['depth'] = speed
-        self.ws_client.diff_book_depth(symbol=symbol.lower(), speed=speed)
-        self.logger.info(f"Started depth stream for {symbol} with {speed}ms updates")
+        sym = self._track_symbol(symbol)
+        self.depth_speeds[sym] = speed
+        self.ws_client.diff_book_depth(symbol=sym, speed=speed)
+        self.logger.info("Started depth stream for %s with %sms updates", symbol, speed)
     
     def start_trade_stream(self, symbol):
         """
@@ -450,14 +565,10 @@ class MarketDataWebsocketManager:
             symbol: Symbol to subscribe to
         """
         self._ensure_client_initialized()
-        self.symbols.add(symbol)
-        
-        if symbol not in self.stream_types:
-            self.stream_types[symbol] = {}
-        
-        self.stream_types[symbol]['trade'] = True
-        self.ws_client.trade(symbol=symbol.lower())
-        self.logger.info(f"Started trade stream for {symbol}")
+        sym = self._track_symbol(symbol)
+        self.trade_symbols.add(sym)
+        self.ws_client.trade(symbol=sym)
+        self.logger.info("Started trade stream for %s", symbol)
     
     def start_bookticker_stream(self, symbol):
         """
@@ -467,14 +578,10 @@ class MarketDataWebsocketManager:
             symbol: Symbol to subscribe to
         """
         self._ensure_client_initialized()
-        self.symbols.add(symbol)
-        
-        if symbol not in self.stream_types:
-            self.stream_types[symbol] = {}
-        
-        self.stream_types[symbol]['bookticker'] = True
-        self.ws_client.book_ticker(symbol=symbol.lower())
-        self.logger.info(f"Started book ticker stream for {symbol}")
+        sym = self._track_symbol(symbol)
+        self.bookticker_symbols.add(sym)
+        self.ws_client.book_ticker(symbol=sym)
+        self.logger.info("Started book ticker stream for %s", symbol)
     
     def start_aggtrade_stream(self, symbol):
         """
@@ -484,14 +591,10 @@ class MarketDataWebsocketManager:
             symbol: Symbol to subscribe to
         """
         self._ensure_client_initialized()
-        self.symbols.add(symbol)
-        
-        if symbol not in self.stream_types:
-            self.stream_types[symbol] = {}
-        
-        self.stream_types[symbol]['aggtrade'] = True
-        self.ws_client.agg_trade(symbol=symbol.lower())
-        self.logger.info(f"Started aggregate trade stream for {symbol}")
+        sym = self._track_symbol(symbol)
+        self.aggtrade_symbols.add(sym)
+        self.ws_client.agg_trade(symbol=sym)
+        self.logger.info("Started aggregate trade stream for %s", symbol)
     
     def start_user_data_stream(self, listen_key):
         """
@@ -509,6 +612,7 @@ class MarketDataWebsocketManager:
             
         self._ensure_client_initialized()
         self.listen_key = listen_key
+        self._user_stream_prefix = b'{"stream":"' + listen_key.encode() + b'"'
         
         self.ws_client.user_data(listen_key=listen_key)
         self.logger.info("Started user data stream")
@@ -520,40 +624,90 @@ class MarketDataWebsocketManager:
         Args:
             symbol: Symbol to subscribe to
             streams: List of streams to start, e.g., ['kline_1m', 'depth', 'trade', 'bookticker']
+            
+        Raises:
+            ValueError: If a stream name is not recognised; nothing is subscribed then
         """
         if not streams:
             streams = ['kline_1m', 'depth', 'trade', 'bookticker']
         
+        # Resolve every stream with one table lookup before touching any subscription state
+        resolved = []
+        for stream in streams:
+            entry = self._STREAM_TABLE.get(stream)
+            if entry is None:
+                if not stream.startswith('kline_'):
+                    raise ValueError(f"Unknown stream type: {stream}")
+                interval = stream[6:]
+                entry = ('kline_intervals', f"@kline_{interval}", interval)
+            resolved.append(entry)
+        
         self._ensure_client_initialized()
-        self.symbols.add(symbol)
+        sym = self._track_symbol(symbol)
+        stream_names = []
+        for container_name, suffix, value in resolved:
+            container = getattr(self, container_name)
+            if value is None:
+                container.add(sym)
+            else:
+                container[sym] = value
+            stream_names.append(sym + suffix)
         
-        if symbol not in self.stream_types:
-            self.stream_types[symbol] = {}
+        # Subscribe to all requested streams with a single SUBSCRIBE frame
+        if stream_names:
+            self.ws_client.subscribe(stream_names)
         
-        for stream in streams:
-            if stream.startswith('kline_'):
-                interval = stream.split('_')[1]
-                self.stream_types[symbol]['kline'] = interval
-                self.ws_client.kline(symbol=symbol.lower(), interval=interval)
-            elif stream == 'depth':
-                self.stream_types[symbol]['depth'] = 100  # Default to 100ms
-                self.ws_client.diff_book_depth(symbol=symbol.lower(), speed=100)
-            elif stream == 'trade':
-                self.stream_types[symbol]['trade'] = True
-                self.ws_client.trade(symbol=symbol.lower())
-            elif stream == 'bookticker':
-                self.stream_types[symbol]['bookticker'] = True
-                self.ws_client.book_ticker(symbol=symbol.lower())
-            elif stream == 'aggtrade':
-                self.stream_types[symbol]['aggtrade'] = True
-                self.ws_client.agg_trade(symbol=symbol.lower())
-        
-        self.logger.info(f"Started multiple streams for {symbol}: {streams}")
+        self.logger.info("Started multiple streams for %s: %s", symbol, streams)
+    
+    def _start_decode_loop(self):
+        """Start the event loop thread that decodes and dispatches frames"""
+        if self._loop is not None:
+            return
+        
+        loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+        self._drain_scheduled = False
+        self._loop_thread = threading.Thread(
+            target=self._run_decode_loop, args=(loop,), name="market-data-decode", daemon=True
+        )
+        self._loop_thread.start()
+        self._loop = loop
+    
+    def _run_decode_loop(self, loop):
+        """
+        Run the decode loop until stopped, then cancel anything pending and close it
+        
+        Args:
+            loop: Event loop owned by the decode thread
+        """
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+    
+    def _stop_decode_loop(self):
+        """Stop the decode loop thread, discarding frames still queued"""
+        loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        
+        loop.call_soon_threadsafe(loop.stop)
+        if self._loop_thread is not threading.current_thread():
+            self._loop_thread.join(timeout=5)
+        self._loop_thread = None
+        self._pending.clear()
+        self._pending_user.clear()
     
     def _ensure_client_initialized(self):
         """Ensure WebSocket client is initialized"""
         if not self.ws_client:
-            self.ws_client = SpotWebsocketStreamClient(
+            self._stop_event.clear()
+            self._start_decode_loop()
+            self.ws_client = ReconnectableStreamClient(
                 stream_url=self.stream_url,
                 on_message=self._message_handler, 
                 on_error=self._error_handler,
@@ -564,11 +718,19 @@ class MarketDataWebsocketManager:
     def stop(self):
         """Stop all WebSocket connections"""
         self.is_running = False
+        self._stop_event.set()
+        with self._reconnect_lock:
+            timer, self._reconnect_timer = self._reconnect_timer, None
+        if timer is not None:
+            timer.cancel()
         if self.ws_client:
             try:
+                # The reader reports the close as an error; it is expected now
+                self.ws_client.socket_manager.retired = True
                 self.ws_client.stop()
                 self.logger.info("Market Data WebSocket streams stopped")
             except Exception as e:
-                self.logger.error(f"Error stopping WebSocket streams: {e}")
+                self.logger.error("Error stopping WebSocket streams: %s", e)
             finally:
                 self.ws_client = None
+        self._stop_decode_loop()
@@ -1,17 +1,45 @@
 import os
 from dotenv import load_dotenv
 
-load_dotenv()  # 加载.env文件中的环境变量，可存放API密钥等敏感信息
+# Looked up once; every setting below reads through this mapping
+_ENVIRON = os.environ
+
+# Accepted spellings of an enabled flag, matched after lowercasing
+_TRUE_VALUES = frozenset({"true", "1", "yes", "on"})
+
+def _env(name, default=None, cast=None):
+    """Read an environment variable, converting it with cast when it is set"""
+    value = _ENVIRON.get(name)
+    if value is None:
+        return default
+    return cast(value) if cast else value
+
+def _to_bool(value):
+    """Parse an environment flag such as true/false, 1/0, yes/no or on/off"""
+    return value.strip().lower() in _TRUE_VALUES
+
+def _to_id_set(value):
+    """Parse a comma-separated list of integer IDs into a set, ignoring blank entries"""
+    return frozenset(int(item) for item in value.split(",") if item.strip())
+
+def _to_optional(value):
+    """Map the literal "None" to None, since .env files cannot express it"""
+    return None if value == "None" else value
+
+# Deployments that inject variables directly (systemd, containers) can set SKIP_DOTENV=true
+if not _env("SKIP_DOTENV", False, _to_bool):
+    load_dotenv()  # 加载.env文件中的环境变量，可存放API密钥等敏感信息
 
 #############################################
 # 账户与API设置
 #############################################
 
 # 敏感信息从环境变量读取
-API_KEY = os.getenv("API_KEY", "")  # 设置API密钥，从环境变量读取，为空则需要手动配置
-PRIVATE_KEY = os.getenv("PRIVATE_KEY", "")  # 设置API私钥，从环境变量读取，为空则需要手动配置
-PRIVATE_KEY_PASS = os.getenv("PRIVATE_KEY_PASS")  # 私钥密码，如使用加密私钥则必须填写
-USE_TESTNET = os.getenv("USE_TESTNET", "false").lower() == "true"  # 是否使用测试网络，改为"true"可切换到测试环境
+API_KEY = _env("API_KEY", "")  # 设置API密钥，从环境变量读取，为空则需要手动配置
+API_SECRET = _env("API_SECRET")  # HMAC API secret, only needed when no private key is used
+PRIVATE_KEY = _env("PRIVATE_KEY", "")  # 设置API私钥，从环境变量读取，为空则需要手动配置
+PRIVATE_KEY_PASS = _env("PRIVATE_KEY_PASS", cast=_to_optional)  # 私钥密码，如使用加密私钥则必须填写
+USE_TESTNET = _env("USE_TESTNET", False, _to_bool)  # 是否使用测试网络，改为"true"可切换到测试环境
 
 # API配置
 BASE_URL = "https://api1.binance.com"  # API基础URL，可修改为其他区域节点如api2.binance.com
@@ -84,8 +112,8 @@ RISK_UPDATE_INTERVAL_MINUTES = 5  # 风险更新间隔(分钟)，减小可更频
 #############################################
 
 # Telegram设置
-TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN", "")  # Telegram机器人token，填入token可启用通知功能
-ALLOWED_TELEGRAM_USERS = [int(user_id.strip()) for user_id in os.getenv("ALLOWED_TELEGRAM_USERS", "").split(",") if user_id.strip()]  # 授权用户ID列表
+TELEGRAM_TOKEN = _env("TELEGRAM_TOKEN", "")  # Telegram机器人token，填入token可启用通知功能
+ALLOWED_TELEGRAM_USERS = _env("ALLOWED_TELEGRAM_USERS", frozenset(), _to_id_set)  # 授权用户ID集合
 ENABLE_TELEGRAM = True  # 是否启用Telegram通知，改为False可关闭通知
 TELEGRAM_NOTIFICATION_LEVEL = "normal"  # 通知级别，可选"minimal"、"normal"、"verbose"
 
@@ -111,6 +139,28 @@ ENABLE_OCO = False  # Enable/disable OCO stop-loss/take-profit orders
                      # Recommended: False for capital < 100 USDT (insufficient for min notional)
                      #             True for capital > 200 USDT (allows proper risk management)
 
+# 配置验证规则：(参数名, 检查函数, 错误信息模板)，仅在检查失败时格式化信息
+_VALIDATION_RULES = (
+    # 验证网格参数
+    ("GRID_LEVELS", lambda v: v >= 3, "GRID_LEVELS必须至少为3，当前值: {}"),
+    ("GRID_SPACING", lambda v: v > 0, "GRID_SPACING必须大于0，当前值: {}"),
+    ("CAPITAL_PER_LEVEL", lambda v: v > 0, "CAPITAL_PER_LEVEL必须大于0，当前值: {}"),
+    ("GRID_RANGE_PERCENT", lambda v: v > 0, "GRID_RANGE_PERCENT必须大于0，当前值: {}"),
+    # 验证交易参数
+    ("TRADING_FEE_RATE", lambda v: v > 0, "TRADING_FEE_RATE必须大于0，当前值: {}"),
+    ("PROFIT_MARGIN_MULTIPLIER", lambda v: v > 1, "PROFIT_MARGIN_MULTIPLIER必须大于1，当前值: {}"),
+    ("BUY_SELL_SPREAD", lambda v: v > 0, "BUY_SELL_SPREAD必须大于0，当前值: {}"),
+    # 验证非对称网格参数
+    ("CORE_ZONE_PERCENTAGE", lambda v: 0 < v < 1, "CORE_ZONE_PERCENTAGE必须在0和1之间，当前值: {}"),
+    ("CORE_CAPITAL_RATIO", lambda v: 0 < v < 1, "CORE_CAPITAL_RATIO必须在0和1之间，当前值: {}"),
+    ("CORE_GRID_RATIO", lambda v: 0 < v < 1, "CORE_GRID_RATIO必须在0和1之间，当前值: {}"),
+    # 验证风险管理参数
+    ("TRAILING_STOP_LOSS_PERCENT", lambda v: v > 0, "TRAILING_STOP_LOSS_PERCENT必须大于0，当前值: {}"),
+    ("TRAILING_TAKE_PROFIT_PERCENT", lambda v: v > 0, "TRAILING_TAKE_PROFIT_PERCENT必须大于0，当前值: {}"),
+    # 验证最小订单价值
+    ("MIN_NOTIONAL_VALUE", lambda v: v > 0, "MIN_NOTIONAL_VALUE必须大于0，当前值: {}"),
+)
+
 def validate_config():
     """验证配置参数的有效性，检测不合理设置"""
     errors = []
@@ -122,49 +172,12 @@ def validate_config():
     if not PRIVATE_KEY and not USE_TESTNET:
         errors.append("PRIVATE_KEY未设置且未启用测试网络")
     
-    # 验证网格参数
-    if GRID_LEVELS < 3:
-        errors.append(f"GRID_LEVELS必须至少为3，当前值: {GRID_LEVELS}")
-    
-    if GRID_SPACING <= 0:
-        errors.append(f"GRID_SPACING必须大于0，当前值: {GRID_SPACING}")
-    
-    if CAPITAL_PER_LEVEL <= 0:
-        errors.append(f"CAPITAL_PER_LEVEL必须大于0，当前值: {CAPITAL_PER_LEVEL}")
-    
-    if GRID_RANGE_PERCENT <= 0:
-        errors.append(f"GRID_RANGE_PERCENT必须大于0，当前值: {GRID_RANGE_PERCENT}")
-    
-    # 验证交易参数
-    if TRADING_FEE_RATE <= 0:
-        errors.append(f"TRADING_FEE_RATE必须大于0，当前值: {TRADING_FEE_RATE}")
-    
-    if PROFIT_MARGIN_MULTIPLIER <= 1:
-        errors.append(f"PROFIT_MARGIN_MULTIPLIER必须大于1，当前值: {PROFIT_MARGIN_MULTIPLIER}")
-        
-    if BUY_SELL_SPREAD <= 0:
-        errors.append(f"BUY_SELL_SPREAD必须大于0，当前值: {BUY_SELL_SPREAD}")
-    
-    # 验证非对称网格参数
-    if not 0 < CORE_ZONE_PERCENTAGE < 1:
-        errors.append(f"CORE_ZONE_PERCENTAGE必须在0和1之间，当前值: {CORE_ZONE_PERCENTAGE}")
-    
-    if not 0 < CORE_CAPITAL_RATIO < 1:
-        errors.append(f"CORE_CAPITAL_RATIO必须在0和1之间，当前值: {CORE_CAPITAL_RATIO}")
-    
-    if not 0 < CORE_GRID_RATIO < 1:
-        errors.append(f"CORE_GRID_RATIO必须在0和1之间，当前值: {CORE_GRID_RATIO}")
-    
-    # 验证风险管理参数
-    if TRAILING_STOP_LOSS_PERCENT <= 0:
-        errors.append(f"TRAILING_STOP_LOSS_PERCENT必须大于0，当前值: {TRAILING_STOP_LOSS_PERCENT}")
-    
-    if TRAILING_TAKE_PROFIT_PERCENT <= 0:
-        errors.append(f"TRAILING_TAKE_PROFIT_PERCENT必须大于0，当前值: {TRAILING_TAKE_PROFIT_PERCENT}")
-    
-    # 验证最小订单价值
-    if MIN_NOTIONAL_VALUE <= 0:
-        errors.append(f"MIN_NOTIONAL_VALUE必须大于0，当前值: {MIN_NOTIONAL_VALUE}")
+    # 按规则表检查数值参数，读取当前值以反映运行时修改
+    settings = globals()
+    for name, check, message in _VALIDATION_RULES:
+        value = settings[name]
+        if not check(value):
+            errors.append(message.format(value))
 
     # 验证复利参数
     if ENABLE_COMPOUND_INTEREST:
@@ -176,9 +189,8 @@ def validate_config():
 # 启动时验证配置（可选，取消注释以启用）
 # config_errors = validate_config()
 # if config_errors:
-#     print("配置验证失败:")
-#     for error in config_errors:
-#         print(f" - {error}")
-#     print("请修正以上错误后重新启动程序。")
 #     import sys
+#     sys.stdout.write("配置验证失败:\n")
+#     sys.stdout.writelines(f" - {error}\n" for error in config_errors)
+#     sys.stdout.write("请修正以上错误后重新启动程序。\n")
 #     sys.exit(1)
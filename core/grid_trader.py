@@ -3,10 +3,11 @@ import math
 import time
 import threading
 from datetime import datetime, timedelta
+from decimal import Decimal
 from binance_api.client import BinanceClient
 from binance.error import ClientError  # Use binance-connector's exception class
 from utils.indicators import calculate_atr
-from utils.format_utils import format_price, format_quantity, get_precision_from_filters
+from utils.format_utils import format_price, format_quantity, get_precision_from_step_size
 import config
 from enum import Enum
 import numpy as np
@@ -29,6 +30,9 @@ class MarketState(Enum):
     PUMP = 4        # Sudden upward price movement
 
 class GridTrader:
+    # Balance reads outside balance_lock before _lock_funds falls back to reading under it
+    _LOCK_FUNDS_ATTEMPTS = 3
+    
     def __init__(self, binance_client, telegram_bot=None):
         """
         Initialize grid trading strategy
@@ -54,6 +58,7 @@ class GridTrader:
         
         # Get symbol information and set precision
         self.symbol_info = self._get_symbol_info()
+        self.symbol_filters = self._index_symbol_filters()
         
         # Store tickSize and stepSize directly from filters
         self.tick_size = self._get_tick_size()
@@ -123,10 +128,13 @@ class GridTrader:
         
         # Track pending operations for better error handling
         self.pending_orders = {}  # Track orders waiting for WebSocket confirmation
+        self._order_index = {}  # str(order_id) -> grid index, verified against the grid on lookup
         
         # Replace locked_balances with pending_locks
         self.pending_locks = {}  # Track temporarily locked funds before order submission
         self.balance_lock = threading.RLock()  # Thread-safe lock for balance operations
+        self._funds_epoch = 0  # Bumped under balance_lock whenever a lock is released after order submission
+        self._setup_snapshot = None  # (thread id, {asset: free balance}) while a grid setup pass is placing orders
         
         # Initialize trend tracking attribute
         self.trend_strength = 0
@@ -191,6 +199,17 @@ class GridTrader:
         """
         return self.symbol_info and 'filters' in self.symbol_info
 
+    def _index_symbol_filters(self):
+        """
+        Index the symbol's exchange filters by filterType in a single pass
+
+        Returns:
+            dict: filterType -> filter, empty if symbol info is unavailable
+        """
+        if not self._is_symbol_info_valid():
+            return {}
+        return {f['filterType']: f for f in self.symbol_info['filters']}
+
     def _get_tick_size(self):
         """
         Get tick size directly from symbol filters
@@ -203,11 +222,11 @@ class GridTrader:
             self.logger.error(error_msg)
             raise ValueError(error_msg)  # Raise an exception to stop further execution
         
-        for f in self.symbol_info['filters']:
-            if f['filterType'] == 'PRICE_FILTER':
-                tick_size = float(f['tickSize'])
-                self.logger.debug(f"Found tick size for {self.symbol}: {tick_size}")
-                return tick_size
+        price_filter = self.symbol_filters.get('PRICE_FILTER')
+        if price_filter:
+            tick_size = float(price_filter['tickSize'])
+            self.logger.debug(f"Found tick size for {self.symbol}: {tick_size}")
+            return tick_size
         fallback_tick_size = self._get_fallback_tick_size()
         self.logger.warning(f"No PRICE_FILTER found for {self.symbol}, using fallback tick size {fallback_tick_size}")
         return fallback_tick_size  # Default if not found
@@ -223,15 +242,13 @@ class GridTrader:
             self.logger.warning(f"Symbol info missing for {self.symbol}. This might occur if the trading pair is invalid, delisted, or there is a connection issue. Using minimum step size 1.0")
             return 1.0  # Default step size
         
-        for f in self.symbol_info['filters']:
-            if f['filterType'] == 'LOT_SIZE':
-                if 'stepSize' in f:
-                    step_size = float(f['stepSize'])
-                    self.logger.debug(f"Found step size for trading pair {self.symbol}: {step_size}")
-                    return step_size
-                else:
-                    self.logger.warning(f"'stepSize' not found in LOT_SIZE filter for {self.symbol}. Filter details: {f}")
-                    continue
+        lot_size_filter = self.symbol_filters.get('LOT_SIZE')
+        if lot_size_filter:
+            if 'stepSize' in lot_size_filter:
+                step_size = float(lot_size_filter['stepSize'])
+                self.logger.debug(f"Found step size for trading pair {self.symbol}: {step_size}")
+                return step_size
+            self.logger.warning(f"'stepSize' not found in LOT_SIZE filter for {self.symbol}. Filter details: {lot_size_filter}")
                 
         fallback_step_size = getattr(config, 'FALLBACK_STEP_SIZE', 1.0)  # Configurable fallback
         self.logger.warning(f"No LOT_SIZE filter found for {self.symbol}, using fallback step size {fallback_step_size}")
@@ -270,7 +287,7 @@ class GridTrader:
             list: K-line data or None on failure
         """
         cache_key = f"{symbol}_{interval}_{limit}"
-        current_time = time.time()
+        current_time = time.monotonic()  # Cache ages must not jump with wall-clock adjustments
         
         with self._kline_cache_lock:
             # Check if cached data exists and is still valid
@@ -417,14 +434,12 @@ class GridTrader:
                 self.logger.error(f"Invalid price value: {price}. Skipping grid level.")
                 continue
             
-            quantity = capital / price
-            
             if level['side'] == 'BUY':
                 # Buy orders need USDT
                 usdt_needed += capital
             else:
                 # Sell orders need base asset
-                base_needed += quantity
+                base_needed += capital / price
         
         # Check balances
         base_balance = self.binance_client.check_balance(base_asset)
@@ -482,7 +497,7 @@ class GridTrader:
         simulation_status = "Simulation mode: ON" if self.simulation_mode else "Simulation mode: OFF"
         message = f"Grid trading system started!\nCurrent price: {self.current_market_price}\nGrid range: {len(self.grid)} levels\nUsing {api_type}\n{simulation_status}"
         try:
-            self._setup_grid()
+            grid_ready = self._setup_grid()
         except Exception as e:
             # Cleanup any partial state if setup fails
             self.logger.error(f"Grid setup failed: {e}", exc_info=True)
@@ -491,14 +506,15 @@ class GridTrader:
             except Exception as cancel_err:
                 self.logger.error(f"Cleanup cancel failed after setup error: {cancel_err}")
             self.grid = []
+            self._order_index = {}
             self.is_running = False
             error_msg = f"Error: Failed to start grid trading due to setup error: {e}"
             if self.telegram_bot:
                 self.telegram_bot.send_message(f"❌ {error_msg}")
             return error_msg
 
-        # Abort start if grid setup failed (no levels generated)
-        if not self.grid:
+        # Abort start if grid setup failed (no levels generated or open orders unavailable)
+        if not grid_ready or not self.grid:
             self.is_running = False
             error_msg = "Error: Grid setup failed; no grid levels or orders were created."
             self.logger.error(error_msg)
@@ -583,7 +599,7 @@ class GridTrader:
                 purchase_usdt = max(purchase_usdt, min_purchase)  # Ensure minimum purchase size
                 
                 # Calculate quantity to buy
-                quantity_to_buy = purchase_usdt / current_price
+                quantity_to_buy = self._quantity_for_capital(purchase_usdt, current_price)
                 
                 # Format quantity according to exchange requirements
                 formatted_quantity = self._adjust_quantity_precision(quantity_to_buy)
@@ -653,6 +669,7 @@ class GridTrader:
                 self.logger.error(f"Error resetting locks: {e}")
                 
             self.grid = []  # Clear grid
+            self._order_index = {}
             self.pending_orders = {}  # Clear pending_orders tracking
             self.last_recalculation = None
             self.is_running = False
@@ -674,7 +691,7 @@ class GridTrader:
                 return 4  # Default fallback
             
             # Extract price filter
-            price_filter = next((f for f in self.symbol_info['filters'] if f['filterType'] == 'PRICE_FILTER'), None)
+            price_filter = self.symbol_filters.get('PRICE_FILTER')
             if not price_filter:
                 self.logger.warning(f"No PRICE_FILTER found for {self.symbol}. Using default precision of 4.")
                 return 4  # Default fallback precision
@@ -683,9 +700,8 @@ class GridTrader:
                 tick_size = float(price_filter['tickSize'])
                 
                 # Calculate precision based on tick size
-                # (e.g. if tickSize is 0.0001, precision is 4)
-                import math
-                precision = -int(math.log10(tick_size))
+                # (e.g. if tickSize is 0.0001, precision is 4; 0.00025 needs 5)
+                precision = get_precision_from_step_size(price_filter['tickSize'])
                 
                 self.logger.info(f"Trading pair {self.symbol} price precision: {precision}")
                 
@@ -716,10 +732,11 @@ class GridTrader:
         if not self._is_symbol_info_valid():
             return 5  # Default quantity precision
         
-        # First try to get from LOT_SIZE filter
-        precision = get_precision_from_filters(self.symbol_info['filters'], 'LOT_SIZE', 'stepSize')
-            
-        return precision
+        # Derive from the LOT_SIZE step, 0 decimals if the filter carries none
+        lot_size_filter = self.symbol_filters.get('LOT_SIZE')
+        if lot_size_filter and lot_size_filter.get('stepSize'):
+            return get_precision_from_step_size(lot_size_filter['stepSize'])
+        return 0
     
     def _adjust_price_precision(self, price):
         """
@@ -739,13 +756,13 @@ class GridTrader:
         Format quantity with appropriate precision for LOT_SIZE filter compliance
         
         Args:
-            quantity (float|str): Original quantity value
+            quantity (Decimal|float|str): Original quantity value; Decimals are floored as-is
             
         Returns:
             str: Formatted quantity string
         """
         try:
-            numeric_quantity = float(quantity)
+            numeric_quantity = quantity if isinstance(quantity, Decimal) else float(quantity)
         except (TypeError, ValueError):
             self.logger.error(f"Invalid quantity value: {quantity}")
             raise ValueError(f"Invalid quantity value: {quantity}")
@@ -756,20 +773,51 @@ class GridTrader:
         
         return format_quantity(numeric_quantity, self.quantity_precision)
     
+    @staticmethod
+    def _quantity_for_capital(capital, price):
+        """
+        Get the base quantity that capital buys at price
+        
+        Computed in Decimal so the LOT_SIZE floor is not pushed down a step by
+        binary float error (e.g. 0.3 / 0.1 == 2.9999999999999996).
+        
+        Args:
+            capital (float): Quote asset amount
+            price (float): Price per unit of base asset
+            
+        Returns:
+            Decimal: Unrounded quantity
+        """
+        return Decimal(str(capital)) / Decimal(str(price))
+    
     def _setup_grid(self):
         """
         Set up grid levels and place initial orders.
 
         This method calculates grid levels based on current market price and ATR.
         It includes fallback mechanisms for ATR calculation failures.
+        
+        Returns:
+            bool: True if the new grid was installed, False if setup was aborted and the current grid kept
         """
         # Calculate grid levels
-        self.grid = self._calculate_grid_levels()
+        new_grid = self._calculate_grid_levels()
         
-        # Check if grid calculation succeeded
-        if not self.grid:
-            self.logger.error("Grid levels calculation returned an empty list. Aborting grid setup.")
-            return
+        # Check if grid calculation succeeded; keep the current grid and the orders it tracks if not
+        if not new_grid:
+            self.logger.error("Grid levels calculation returned an empty list. Aborting grid setup and keeping the current grid.")
+            return False
+        
+        # Fetch open orders before replacing the grid: without them we can neither adopt nor cancel
+        # the current orders, and placing a new grid would stack it on top of untracked ones
+        try:
+            open_orders = self.binance_client.get_open_orders(self.symbol)
+        except Exception as e:
+            self.logger.error(f"Failed to fetch open orders for grid setup: {e}. Aborting grid setup and keeping the current grid.")
+            return False
+        
+        self.grid = new_grid
+        self._order_index = {}
         
         # Update ATR value and trend strength using optimized mixed timeframes
         atr_value, trend_strength = self.calculate_market_metrics()
@@ -791,7 +839,8 @@ class GridTrader:
         self.using_websocket = client_status["websocket_available"]
         
         # Place grid orders using the unified method
-        self._initialize_grid_orders()
+        self._initialize_grid_orders(open_orders)
+        return True
 
     def _calculate_max_buy_levels(self, usdt_balance, current_price):
         """
@@ -1060,7 +1109,7 @@ class GridTrader:
                 # Safety cap: don't spend more than 90% of available USDT
                 usdt_to_spend = min(usdt_to_spend, usdt_balance * 0.9)
                 
-                qty = usdt_to_spend / current_price
+                qty = self._quantity_for_capital(usdt_to_spend, current_price)
                 
                 self.logger.info(f"REBALANCE: Buying ~{qty:.8f} {base_asset} (~{usdt_to_spend:.2f} USDT)")
                 if self.telegram_bot:
@@ -2073,34 +2122,33 @@ class GridTrader:
             self.logger.error(f"Error cancelling orders: {e}")
             return False
     
-    def _initialize_grid_orders(self):
+    def _initialize_grid_orders(self, open_orders):
         """
         Place all grid orders with unified logic for both WebSocket and REST APIs.
-        Processes all grid levels sequentially, adopting existing orders where possible.
+        Adopts existing orders that match a grid level, cancels the unadopted ones,
+        then places orders only for the levels left without one.
+        
+        Args:
+            open_orders: Open orders on the exchange for the symbol, fetched before the grid was replaced
         """
         orders_placed = 0
         orders_adopted = 0
         
-        # Fetch all open orders once to check for existing ones
-        try:
-            open_orders = self.binance_client.get_open_orders(self.symbol)
-            # Create a mapping for efficient lookup: (side, price) -> order_id
-            # We use a small tolerance for price matching
-            existing_orders = []
-            for order in open_orders:
-                existing_orders.append({
-                    'orderId': order['orderId'],
-                    'price': float(order['price']),
-                    'side': order['side'],
-                    'origQty': float(order['origQty']),
-                    'orderListId': order.get('orderListId', -1)
-                })
-            self.logger.info(f"Found {len(existing_orders)} existing open orders on exchange")
-        except Exception as e:
-            self.logger.error(f"Failed to fetch open orders during initialization: {e}")
-            existing_orders = []
+        # We use a small tolerance for price matching
+        existing_orders = []
+        for order in open_orders:
+            existing_orders.append({
+                'orderId': order['orderId'],
+                'price': float(order['price']),
+                'side': order['side'],
+                'origQty': float(order['origQty']),
+                'orderListId': order.get('orderListId', -1)
+            })
+        self.logger.info(f"Found {len(existing_orders)} existing open orders on exchange")
 
-        for level in self.grid:
+        adopted_indices = {}  # str(order_id) -> index of the new level that adopted it
+        levels_to_place = []
+        for index, level in enumerate(self.grid):
             # Validate grid level data before placing the order
             if 'price' not in level or 'side' not in level or level['price'] <= 0 or level['side'] not in ['BUY', 'SELL']:
                 self.logger.error(f"Invalid grid level data: {level}. Skipping order placement.")
@@ -2112,8 +2160,8 @@ class GridTrader:
             target_side = level['side']
             
             for order in existing_orders:
-                # Check side match
-                if order['side'] != target_side:
+                # Check side match; OCO legs belong to RiskManager and are never adopted as grid orders
+                if order['side'] != target_side or order['orderListId'] != -1:
                     continue
                     
                 # Check price match with small tolerance (0.1%)
@@ -2125,19 +2173,18 @@ class GridTrader:
             if matched_order:
                 # Adopt the existing order
                 level['order_id'] = matched_order['orderId']
+                self._track_order_id(index, matched_order['orderId'])
+                adopted_indices[str(matched_order['orderId'])] = index
                 self.logger.info(f"Adopting existing {target_side} order {matched_order['orderId']} at {matched_order['price']} (Target: {target_price})")
                 orders_adopted += 1
                 
                 # Remove from existing_orders so we don't match it again (though unlikely with grid spacing)
                 existing_orders.remove(matched_order)
             else:
-                # Call the single order placement method for each level
-                if self._place_grid_order(level):
-                    orders_placed += 1
-        
-        self.logger.info(f"Grid initialization complete: {orders_placed} new orders placed, {orders_adopted} existing orders adopted")
+                levels_to_place.append((index, level))
 
-        # Cleanup: Cancel any remaining orders that were not adopted (duplicates)
+        # Cleanup: Cancel any remaining orders that were not adopted (duplicates or levels dropped by a recalculation)
+        # Done before placing new orders so the funds they hold are available to them
         # CRITICAL: Do NOT cancel OCO orders (orderListId != -1) as they are managed by RiskManager
         if existing_orders:
             self.logger.info(f"Cleaning up {len(existing_orders)} unadopted orders...")
@@ -2148,20 +2195,40 @@ class GridTrader:
                     continue
                 
                 try:
-                    self.logger.warning(f"Cancelling unadopted duplicate order: {order['side']} @ {order['price']} (ID: {order['orderId']})")
+                    self.logger.warning(f"Cancelling unadopted order: {order['side']} @ {order['price']} (ID: {order['orderId']})")
                     self.binance_client.cancel_order(symbol=self.symbol, order_id=order['orderId'])
                 except Exception as e:
                     self.logger.error(f"Failed to cleanup order {order['orderId']}: {e}")
+
+        # Old grid indices are meaningless in the new grid: re-point adopted orders at their new level
+        # and stop tracking every other order, whether it was cancelled or left on the exchange
+        self.pending_orders = {
+            order_id: dict(info, grid_index=adopted_indices[order_id])
+            for order_id, info in self.pending_orders.items()
+            if order_id in adopted_indices
+        }
+
+        # Fetch each free balance once for the pass and draw it down locally as orders are accepted
+        self._setup_snapshot = (threading.get_ident(), {})
+        try:
+            for index, level in levels_to_place:
+                # Call the single order placement method for each level without an adopted order
+                if self._place_grid_order(level, index):
+                    orders_placed += 1
+        finally:
+            self._setup_snapshot = None
         
+        self.logger.info(f"Grid initialization complete: {orders_placed} new orders placed, {orders_adopted} existing orders adopted")
         self.logger.info(f"Grid setup complete: {orders_placed} orders placed out of {len(self.grid)} grid levels")
         return orders_placed > 0
     
-    def _place_grid_order(self, level):
+    def _place_grid_order(self, level, level_index=None):
         """
         Place a single grid order with unified WebSocket/REST handling
         
         Args:
             level: The grid level dictionary with order details
+            level_index: Index of the level in the grid, looked up if not given
             
         Returns:
             bool: True if successful, False otherwise
@@ -2183,7 +2250,7 @@ class GridTrader:
             return False
             
         # Calculate order quantity based on level's capital
-        quantity = capital / price
+        quantity = self._quantity_for_capital(capital, price)
         
         # Adjust quantity and price precision
         formatted_quantity = self._adjust_quantity_precision(quantity)
@@ -2263,11 +2330,13 @@ class GridTrader:
                 # Update the grid level with order ID
                 level['order_id'] = order['orderId']
                 level['timestamp'] = int(time.time())  # Add timestamp for order age tracking
+                self._track_order_id(level_index, order['orderId'])
+                self._draw_setup_balance(asset, required)
                 
                 # Add to pending orders for WebSocket response tracking (if using WebSocket)
                 if self.using_websocket:
                     self.pending_orders[str(order['orderId'])] = {
-                        'grid_index': self.grid.index(level),
+                        'grid_index': level_index if level_index is not None else self.grid.index(level),
                         'side': side,
                         'price': float(formatted_price),
                         'quantity': float(formatted_quantity),
@@ -2285,16 +2354,16 @@ class GridTrader:
                 return True
                 
             except Exception as e:
-                # Release the funds if order placement fails
+                # Release the funds if order placement fails, and refetch the balance for the next order
                 self._release_funds(asset, required)
+                self._draw_setup_balance(asset, None)
                 self.logger.error(f"Failed to place order: {side} {formatted_quantity} @ {formatted_price}, Error: {e}")
                 
                 # Check if connection was lost and retry with fallback
                 if "connection" in str(e).lower() and self.using_websocket:
                     self.logger.warning("WebSocket connection issue detected, retrying with REST fallback...")
                     
-                    # Update status and retry placement
-                    client_status = self.binance_client.get_client_status()
+                    # Retry placement over REST
                     self.using_websocket = False  # Force REST for fallback
                     
                     try:
@@ -2308,6 +2377,8 @@ class GridTrader:
                         
                         level['order_id'] = order['orderId']
                         level['timestamp'] = int(time.time())
+                        self._track_order_id(level_index, order['orderId'])
+                        self._draw_setup_balance(asset, required)
                         
                         self.logger.info(f"Order placed via REST fallback: {side} {formatted_quantity} @ {formatted_price}, "
                                         f"ID: {order['orderId']}")
@@ -2475,11 +2546,10 @@ class GridTrader:
         # Handle full grid recalculation (includes out-of-bounds confirmation, time-based, volatility, and deadlock triggers)
         if time_based_recalc or volatility_based_recalc or out_of_bounds_recalc or deadlock_recalc:
             try:
-                # Cancel all orders
-                self._cancel_all_open_orders()
-                
-                # Recalculate grid
-                self._setup_grid()
+                # Recalculate grid; orders still matching a new level are adopted, only the rest are cancelled and replaced
+                if not self._setup_grid():
+                    self.logger.warning("Grid recalculation aborted; keeping the current grid and its orders")
+                    return False
                 
                 # Update last recalculation timestamp
                 self.last_recalculation = now
@@ -2560,9 +2630,10 @@ class GridTrader:
                 self.logger.info(
                     f"Real-time price {price:.8f} out of grid [{lower:.8f}, {upper:.8f}] from {source}; triggering immediate recalculation"
                 )
-                # Cancel and rebuild grid quickly
-                self._cancel_all_open_orders()
-                self._setup_grid()
+                # Rebuild grid quickly; orders still matching a new level are adopted, only the rest are cancelled and replaced
+                if not self._setup_grid():
+                    self.logger.warning("Real-time grid recalculation aborted; keeping the current grid and its orders")
+                    return
                 self.last_recalculation = datetime.now()
                 self._last_realtime_recalc = now
         except Exception as exc:
@@ -2580,7 +2651,7 @@ class GridTrader:
             open_order_ids = set(str(order['orderId']) for order in open_orders)
             
             # Update grid with current open orders
-            for level in self.grid:
+            for idx, level in enumerate(self.grid):
                 if level.get('order_id'):
                     order_id = str(level['order_id'])
                     # If order is in our grid but not actually open, mark it
@@ -2600,7 +2671,6 @@ class GridTrader:
                                     price_val = float(quote_qty) / float(qty)
                                 price_val = float(price_val) if price_val else level.get("price", 0)
                                 # Trigger filled flow
-                                idx = self.grid.index(level)
                                 self._process_filled_order(level, idx, level.get("side"), qty, price_val)
                                 continue
                             elif status in ("CANCELED", "EXPIRED", "REJECTED"):
@@ -2645,13 +2715,7 @@ class GridTrader:
             self.logger.debug(f"Pending order {str_order_id} fulfilled from tracking")
         
         # Find matching grid level
-        matching_level = None
-        level_index = -1
-        for i, level in enumerate(self.grid):
-            if level['order_id'] == order_id or str(level['order_id']) == str_order_id:
-                matching_level = level
-                level_index = i
-                break
+        matching_level, level_index = self._find_grid_level(str_order_id)
         
         if not matching_level:
             self.logger.warning(f"Received fill for order {order_id} but couldn't find in grid")
@@ -2664,9 +2728,36 @@ class GridTrader:
         # This ensures that even if the replacement order fails, the slot is marked as empty
         # and will be picked up by the _check_for_unfilled_grid_slots loop
         matching_level['order_id'] = None
+        self._order_index.pop(str_order_id, None)
         
         self._process_filled_order(matching_level, level_index, side, quantity, price)
     
+    def _track_order_id(self, level_index, order_id):
+        """Record the grid index holding order_id so fills resolve without scanning the grid"""
+        if level_index is not None and level_index >= 0:
+            self._order_index[str(order_id)] = level_index
+    
+    def _find_grid_level(self, str_order_id):
+        """
+        Find the grid level holding an order
+        
+        Args:
+            str_order_id: Exchange order ID as a string
+            
+        Returns:
+            tuple: (level, index), or (None, -1) if no grid level holds the order
+        """
+        index = self._order_index.get(str_order_id)
+        if index is not None and index < len(self.grid) and str(self.grid[index].get('order_id')) == str_order_id:
+            return self.grid[index], index
+        
+        # Untracked or stale entry (e.g. level rewritten elsewhere): scan once and remember the result
+        for i, level in enumerate(self.grid):
+            if str(level.get('order_id')) == str_order_id:
+                self._order_index[str_order_id] = i
+                return level, i
+        return None, -1
+    
     # OPTIMIZED: Extract order data method to reduce code duplication
     def _extract_order_data(self, order_data):
         """
@@ -2867,6 +2958,7 @@ class GridTrader:
                         # Update grid level
                         matching_level['side'] = new_side
                         matching_level['order_id'] = order['orderId']
+                        self._track_order_id(level_index, order['orderId'])
 
                         # Add to pending orders tracking if using WebSocket
                         if self.using_websocket:
@@ -2896,8 +2988,6 @@ class GridTrader:
                             try:
                                 self.logger.warning("Connection error - falling back to REST API for opposite order")
 
-                                # Force update of client status
-                                client_status = self.binance_client.get_client_status()
                                 self.using_websocket = False  # Force REST for fallback
 
                                 # Try again with REST
@@ -2911,6 +3001,7 @@ class GridTrader:
                                 # Update grid
                                 matching_level['side'] = new_side
                                 matching_level['order_id'] = order['orderId']
+                                self._track_order_id(level_index, order['orderId'])
 
                                 if self.using_websocket:
                                     self.pending_orders[str(order['orderId'])] = {
@@ -3010,28 +3101,93 @@ class GridTrader:
         Returns:
             bool: True if funds were successfully locked, False otherwise
         """
+        for _ in range(self._LOCK_FUNDS_ATTEMPTS):
+            # Get directly available balance from Binance (already accounts for open orders).
+            # Fetched before taking the lock so the round trip does not block other lock holders;
+            # concurrent reservations are still serialised through pending_locks below.
+            epoch = self._funds_epoch
+            available = self._get_available_balance(asset)
+            
+            with self.balance_lock:
+                if self._funds_epoch != epoch:
+                    # Another order released its lock after the read, so its funds may have left the
+                    # exchange balance without still being counted in pending_locks: read again
+                    continue
+                return self._reserve_funds(asset, amount, available)
+        
+        # Releases kept racing the reads: read once more with the lock held so nothing can release meanwhile
+        self.logger.warning(
+            f"{asset} balance changed during {self._LOCK_FUNDS_ATTEMPTS} reads; re-reading it under the balance lock"
+        )
         with self.balance_lock:
-            # Get directly available balance from Binance (already accounts for open orders)
-            available = self.binance_client.check_balance(asset)
-            locked_amount = self.pending_locks.get(asset, 0.0)
-            effective_available = max(available - locked_amount, 0.0)
-            
-            # Check if we have enough available balance
-            if effective_available < amount:
-                self.logger.warning(
-                    f"Insufficient {asset} balance for order: "
-                    f"Required: {amount}, Available: {available}, "
-                    f"Locked: {locked_amount}"
-                )
-                return False
+            available = self._get_available_balance(asset)
+            return self._reserve_funds(asset, amount, available)
+    
+    def _reserve_funds(self, asset, amount, available):
+        """
+        Reserve funds against a freshly read balance; the caller must hold balance_lock
+        
+        Args:
+            asset: Asset symbol (e.g., 'BTC', 'USDT')
+            amount: Amount to lock
+            available: Free balance read after the last release of this asset
             
-            # Lock the funds temporarily until order is submitted
-            self.pending_locks[asset] = locked_amount + amount
-            self.logger.debug(
-                f"Temporarily locked {amount} {asset}, effective free: {effective_available}, "
-                f"pending locks: {self.pending_locks[asset]}"
+        Returns:
+            bool: True if funds were successfully locked, False otherwise
+        """
+        locked_amount = self.pending_locks.get(asset, 0.0)
+        effective_available = max(available - locked_amount, 0.0)
+        
+        # Check if we have enough available balance
+        if effective_available < amount:
+            self.logger.warning(
+                f"Insufficient {asset} balance for order: "
+                f"Required: {amount}, Available: {available}, "
+                f"Locked: {locked_amount}"
             )
-            return True
+            return False
+        
+        # Lock the funds temporarily until order is submitted
+        self.pending_locks[asset] = locked_amount + amount
+        self.logger.debug(
+            "Temporarily locked %s %s, effective free: %s, pending locks: %s",
+            amount, asset, effective_available, self.pending_locks[asset]
+        )
+        return True
+    
+    def _get_available_balance(self, asset):
+        """
+        Get the free balance of an asset, from the setup pass snapshot when this thread is running one
+        
+        Args:
+            asset: Asset symbol (e.g., 'BTC', 'USDT')
+            
+        Returns:
+            float: Free balance
+        """
+        snapshot = self._setup_snapshot
+        if snapshot is None or snapshot[0] != threading.get_ident():
+            return self.binance_client.check_balance(asset)
+        balances = snapshot[1]
+        if asset not in balances:
+            balances[asset] = self.binance_client.check_balance(asset)
+        return balances[asset]
+    
+    def _draw_setup_balance(self, asset, amount):
+        """
+        Deduct an accepted order from the setup pass snapshot
+        
+        Args:
+            asset: Asset symbol (e.g., 'BTC', 'USDT')
+            amount: Amount now held by the order, or None to drop the asset and refetch it
+        """
+        snapshot = self._setup_snapshot
+        if snapshot is None or snapshot[0] != threading.get_ident() or asset not in snapshot[1]:
+            return
+        if amount is None:
+            del snapshot[1][asset]
+        else:
+            snapshot[1][asset] -= amount
     
     def _release_funds(self, asset, amount):
         """
@@ -3049,13 +3205,15 @@ class GridTrader:
             
             if release_amount > 0:
                 self.pending_locks[asset] = current_pending - release_amount
-                self.logger.debug(f"Released {release_amount} {asset} from pending locks, remaining: {self.pending_locks.get(asset, 0)}")
+                self._funds_epoch += 1
+                self.logger.debug("Released %s %s from pending locks, remaining: %s", release_amount, asset, self.pending_locks[asset])
     
     def _reset_locks(self):
         """Reset all temporary fund locks when stopping grid or recalculating"""
         with self.balance_lock:
             previous_locks = self.pending_locks.copy()
             self.pending_locks = {}
+            self._funds_epoch += 1
             self.logger.info(f"Reset all pending locks. Previous locks: {previous_locks}")
 
     def _check_for_unfilled_grid_slots(self):
@@ -3081,7 +3239,7 @@ class GridTrader:
                 continue
 
             try:
-                if self._place_grid_order(level):
+                if self._place_grid_order(level, index):
                     replacements += 1
                 else:
                     self.logger.warning(
@@ -3175,7 +3333,7 @@ class GridTrader:
                 self.grid[i]['capital'] = new_grid[new_index]['capital']
                 
                 # Place the new order
-                self._place_grid_order(self.grid[i])
+                self._place_grid_order(self.grid[i], i)
                 
         return len(orders_to_cancel)
     
@@ -3189,9 +3347,12 @@ class GridTrader:
         self.symbol = new_symbol
         
         # Get new symbol information and update precisions
-        symbol_info = self.binance_client.get_symbol_info(self.symbol)
+        self.symbol_info = self._get_symbol_info()
+        self.symbol_filters = self._index_symbol_filters()
         
-        # Reset and update precision values 
+        # Reset and update tick/step sizes and precision values 
+        self.tick_size = self._get_tick_size()
+        self.step_size = self._get_step_size()
         self.price_precision = self._get_price_precision()
         self.quantity_precision = self._get_quantity_precision()
         # Re-evaluate protective mode based on symbol category
@@ -3205,6 +3366,7 @@ class GridTrader:
         
         # Update other relevant properties
         self.pending_orders = {}
+        self._order_index = {}
         self.pending_locks = {}
         self.balance_lock = threading.RLock()
         
@@ -3266,7 +3428,7 @@ class GridTrader:
 
         # Update the grid level and place the order
         self.grid[level_index] = new_level
-        self._place_grid_order(new_level)
+        self._place_grid_order(new_level, level_index)
         
         self.logger.info(f"Placed replacement grid order: {side} at price {price:.8f} to maintain grid density")
     
@@ -66,6 +66,7 @@ class RiskManager:
         self.symbol_info = self._get_symbol_info()
         self.price_precision = self._get_price_precision()
         self.quantity_precision = self._get_quantity_precision()
+        self.price_multipliers = self._get_price_multipliers()
         
         # Price tracking variables
         self.stop_loss_price = None
@@ -146,6 +147,35 @@ class RiskManager:
         if not self.symbol_info or 'filters' not in self.symbol_info:
             return 5  # Default quantity precision
         return get_precision_from_filters(self.symbol_info['filters'], 'LOT_SIZE', 'stepSize')
+    
+    def _get_price_multipliers(self):
+        """
+        Get the allowed order price range from the percent price filters
+        
+        PERCENT_PRICE_BY_SIDE takes precedence over PERCENT_PRICE, since it
+        is the filter Binance applies to the SELL side of OCO orders.
+        
+        Returns:
+            tuple: (down, up) multipliers of the current price
+        """
+        multipliers = (0.85, 1.15)  # Default: 15% either side of the current price
+        if not self.symbol_info or 'filters' not in self.symbol_info:
+            return multipliers
+        
+        for filter_item in self.symbol_info['filters']:
+            if filter_item['filterType'] == 'PERCENT_PRICE_BY_SIDE':
+                multipliers = (
+                    float(filter_item.get('askMultiplierDown', 0.8)),
+                    float(filter_item.get('bidMultiplierUp', 1.2)),
+                )
+                self.logger.info(f"Using PERCENT_PRICE_BY_SIDE filter multipliers: {multipliers[0]} to {multipliers[1]}")
+                break
+            elif filter_item['filterType'] == 'PERCENT_PRICE':
+                multipliers = (
+                    float(filter_item.get('multiplierDown', 0.8)),
+                    float(filter_item.get('multiplierUp', 1.2)),
+                )
+        return multipliers
         
     def _adjust_price_precision(self, price):
         """
@@ -598,33 +628,10 @@ class RiskManager:
             # Set quantity with remaining available assets and format
             quantity = self._adjust_quantity_precision(asset_balance)
             
-            # Get symbol info for price filter constraints
-            symbol_info = self.binance_client.get_symbol_info(self.symbol)
-            
-            # Initialize price range variables
-            min_price = current_price * 0.85  # Default: 15% below current price 
-            max_price = current_price * 1.15  # Default: 15% above current price
-            
-            # Get correct price filters based on symbol_info
-            if symbol_info and 'filters' in symbol_info:
-                for filter_item in symbol_info['filters']:
-                    if filter_item['filterType'] == 'PERCENT_PRICE_BY_SIDE':
-                        # This filter is most relevant for OCO orders
-                        bid_multiplier_up = float(filter_item.get('bidMultiplierUp', 1.2))
-                        ask_multiplier_down = float(filter_item.get('askMultiplierDown', 0.8))
-                        
-                        # Apply specific multipliers for OCO with SELL side
-                        max_price = current_price * bid_multiplier_up
-                        min_price = current_price * ask_multiplier_down
-                        
-                        self.logger.info(f"Applied PERCENT_PRICE_BY_SIDE filter: {min_price:.4f} to {max_price:.4f}")
-                        break
-                    elif filter_item['filterType'] == 'PERCENT_PRICE':
-                        # Generic percent price filter
-                        multiplier_up = float(filter_item.get('multiplierUp', 1.2))
-                        multiplier_down = float(filter_item.get('multiplierDown', 0.8))
-                        max_price = current_price * multiplier_up
-                        min_price = current_price * multiplier_down
+            # Price range allowed by the symbol's percent price filters, parsed once per symbol
+            multiplier_down, multiplier_up = self.price_multipliers
+            min_price = current_price * multiplier_down
+            max_price = current_price * multiplier_up
             
             # Apply additional safety margin to avoid edge cases
             safe_max = max_price * 0.95  # Stay 5% below maximum
@@ -1167,6 +1174,7 @@ class RiskManager:
         self.symbol_info = self._get_symbol_info()
         self.price_precision = self._get_price_precision()
         self.quantity_precision = self._get_quantity_precision()
+        self.price_multipliers = self._get_price_multipliers()
         
         self.logger.info(f"Risk manager symbol updated from {old_symbol} to {new_symbol}")
 
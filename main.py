@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 import threading
@@ -12,6 +13,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import custom modules
 from binance_api.client import BinanceClient
 from binance_api.websocket_manager import MarketDataWebsocketManager
+from binance_api.schemas import (
+    AccountPositionMessage, BalanceUpdateMessage, BookTickerMessage, ExecutionReportMessage, KlineMessage,
+    ListStatusMessage,
+)
 from core.grid_trader import GridTrader
 from core.risk_manager import RiskManager
 from tg_bot.bot import TelegramBot
@@ -43,6 +48,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logging.getLogger('binance_api').setLevel(logging.INFO)  # Changed from DEBUG to reduce log noise
 
+def _get_field(message, key, default=None):
+    """Read a field from a WebSocket message delivered either as a dict or as an object"""
+    if isinstance(message, dict):
+        return message.get(key, default)
+    return getattr(message, key, default)
+
 class GridTradingBot:
     def __init__(self):
         """Initialize the trading bot with all necessary components"""
@@ -56,6 +67,23 @@ class GridTradingBot:
         self.keep_alive_thread = None
         self.logger = logging.getLogger(__name__)
         
+        # WebSocket dispatch tables: decoded schemas by their type, fallback dicts by event type ('e')
+        self._message_type_handlers = {
+            KlineMessage: self._handle_kline_update,
+            BookTickerMessage: self._handle_book_ticker_update,
+            ExecutionReportMessage: self._handle_order_update,
+            ListStatusMessage: self._handle_oco_update,
+            AccountPositionMessage: self._handle_account_position_update,
+            BalanceUpdateMessage: self._handle_account_position_update,
+        }
+        self._event_handlers = {
+            'kline': self._handle_kline_update,
+            'executionReport': self._handle_order_update,
+            'listStatus': self._handle_oco_update,
+            'outboundAccountPosition': self._handle_account_position_update,
+            'balanceUpdate': self._handle_account_position_update,
+        }
+        
         # Initialize state management
         self.state_lock = RLock()
         with self.state_lock:
@@ -151,80 +179,56 @@ class GridTradingBot:
     def _handle_websocket_message(self, message):
         """Process WebSocket messages with focus on business logic only"""
         try:
-            # DEBUG: Log message type to debug missing execution reports
-            msg_type = getattr(message, 'e', message.get('e') if isinstance(message, dict) else 'unknown')
-            # Log ALL messages to verify connectivity
-            self.logger.info(f"Received WS message: type={msg_type}, keys={list(message.keys()) if isinstance(message, dict) else dir(message)}")
+            # Log ALL messages to verify connectivity (only built when debug logging is on)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Received WS message: type=%s", type(message).__name__)
 
-            # Handle kline events for price updates
-            if (hasattr(message, 'e') and message.e == 'kline' and 
-                hasattr(message, 'k') and hasattr(message.k, 'c') and 
-                hasattr(message, 's')):  # Added check for 's' attribute
-                
-                symbol = message.s
-                price = float(message.k.c)
-                
-                if symbol == config.SYMBOL:
-                    # WS-first fast path for grid recalculation on live price
-                    if self.grid_trader:
-                        self.grid_trader.handle_realtime_price(price, source="kline")
-                    # Check risk management conditions if active
-                    if self.risk_manager and self.risk_manager.is_active:
-                        self.risk_manager.check_price(price)
-            
-            # Handle execution reports for order updates
-            elif hasattr(message, 'e') and message.e == 'executionReport':
-                self.grid_trader.handle_order_update(message)
-                
-            # Handle order list status updates (OCO orders)
-            elif hasattr(message, 'e') and message.e == 'listStatus':
-                self._handle_oco_update(message)
-            
-            # Handle account balance/position updates
-            elif hasattr(message, 'e') and message.e in ('outboundAccountPosition', 'balanceUpdate'):
-                self._handle_account_position_update(message)
-            
-            # Handle bookTicker without 'e' field (from MarketDataWebsocketManager)
-            elif isinstance(message, dict) and all(k in message for k in ('s', 'b', 'a')):
-                sym = message.get('s')
-                if sym == config.SYMBOL and self.grid_trader:
-                    try:
-                        mid_price = (float(message['b']) + float(message['a'])) / 2
-                        self.grid_trader.handle_realtime_price(mid_price, source="bookTicker")
-                    except Exception:
-                        pass
-            elif hasattr(message, 'b') and hasattr(message, 'a') and hasattr(message, 's'):
-                if getattr(message, 's') == config.SYMBOL and self.grid_trader:
-                    try:
-                        mid_price = (float(message.b) + float(message.a)) / 2
-                        self.grid_trader.handle_realtime_price(mid_price, source="bookTicker")
-                    except Exception:
-                        pass
-                
-        except AttributeError:
-            # Handle dict-format messages as fallback
-            if isinstance(message, dict):
-                if ('e' in message and message['e'] == 'kline' and 
-                    'k' in message and 'c' in message.get('k', {}) and
-                    's' in message):  # Added check for 's' key
-                    
-                    symbol = message['s']
-                    price = float(message['k']['c'])
-                    
-                    if symbol == config.SYMBOL:
-                        if self.risk_manager and self.risk_manager.is_active:
-                            self.risk_manager.check_price(price)
-                
-                elif 'e' in message and message['e'] == 'executionReport':
-                    self.grid_trader.handle_order_update(message)
-                    
-                elif 'e' in message and message['e'] == 'listStatus':
-                    self._handle_oco_update(message)
-                
-                elif 'e' in message and message['e'] in ('outboundAccountPosition', 'balanceUpdate'):
-                    self._handle_account_position_update(message)
+            # Decoded schemas dispatch on their type, without reading the event string
+            handler = self._message_type_handlers.get(type(message))
+            if handler:
+                handler(message)
+                return
+
+            msg_type = _get_field(message, 'e')
+            handler = self._event_handlers.get(msg_type)
+            if handler:
+                handler(message)
+            elif msg_type is None:
+                # bookTicker payloads carry no 'e' field
+                self._handle_book_ticker_update(message)
         except Exception as e:
             self.logger.error(f"Failed to process WebSocket message: {e}")
+
+    def _handle_kline_update(self, message):
+        """Feed the latest kline close price to grid and risk management"""
+        symbol = _get_field(message, 's')
+        close_price = _get_field(_get_field(message, 'k'), 'c')
+        if symbol != config.SYMBOL or close_price is None:
+            return
+        
+        price = float(close_price)
+        # WS-first fast path for grid recalculation on live price
+        if self.grid_trader:
+            self.grid_trader.handle_realtime_price(price, source="kline")
+        # Check risk management conditions if active
+        if self.risk_manager and self.risk_manager.is_active:
+            self.risk_manager.check_price(price)
+
+    def _handle_book_ticker_update(self, message):
+        """Feed the best bid/ask mid price to the grid trader"""
+        bid = _get_field(message, 'b')
+        ask = _get_field(message, 'a')
+        if bid is None or ask is None or _get_field(message, 's') != config.SYMBOL or not self.grid_trader:
+            return
+        try:
+            mid_price = (float(bid) + float(ask)) / 2
+            self.grid_trader.handle_realtime_price(mid_price, source="bookTicker")
+        except Exception:
+            pass
+
+    def _handle_order_update(self, message):
+        """Forward execution reports to the grid trader"""
+        self.grid_trader.handle_order_update(message)
         
     def _handle_oco_update(self, message):
         """Handle OCO order updates with standardized access pattern"""
@@ -668,5 +672,12 @@ class GridTradingBot:
 
 
 if __name__ == "__main__":
+    # Run every asyncio loop in the process (Telegram polling, stream decoding) on uvloop where available
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     bot = GridTradingBot()
     bot.start()
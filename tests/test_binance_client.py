@@ -210,6 +210,26 @@ class TestBinanceClient(unittest.TestCase):
             self.mock_ws_client.account.assert_called_once()
             self.assertEqual(result, {'balances': []})
 
+    def test_check_balance_reuses_snapshot_until_order_write(self):
+        """Test check_balance shares one account request until an order changes balances"""
+        with patch('binance_api.client.WEBSOCKET_API_AVAILABLE', True):
+            client = BinanceClient()
+            client.websocket_available = True
+            
+            self.mock_ws_client.account.return_value = {'status': 200, 'result': {'balances': [
+                {'asset': 'BTC', 'free': '0.5', 'locked': '0'},
+                {'asset': 'USDT', 'free': '100', 'locked': '0'},
+            ]}}
+            self.mock_ws_client.cancel_order.return_value = {'status': 200, 'result': {'orderId': 1}}
+            
+            self.assertEqual(client.check_balance('BTC'), 0.5)
+            self.assertEqual(client.check_balance('usdt'), 100.0)
+            self.assertEqual(self.mock_ws_client.account.call_count, 1)
+            
+            client.cancel_order('BTCUSDT', 1)
+            client.check_balance('USDT')
+            self.assertEqual(self.mock_ws_client.account.call_count, 2)
+
     def test_get_exchange_info(self):
         """Test get_exchange_info"""
         with patch('binance_api.client.WEBSOCKET_API_AVAILABLE', True):
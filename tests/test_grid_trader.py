@@ -3,6 +3,7 @@ import threading
 import types
 import sys
 import unittest
+from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
 binance_module = types.ModuleType("binance")
@@ -104,6 +105,9 @@ def create_trader(simulation_mode, risk_manager):
     trader._release_funds = MagicMock()
     trader.pending_orders = {}
     trader.pending_locks = {}
+    trader._order_index = {}
+    trader._funds_epoch = 0
+    trader._setup_snapshot = None
     return trader
 
 
@@ -157,5 +161,210 @@ class ProcessFilledOrderRiskTests(unittest.TestCase):
         trader.binance_client.place_limit_order.assert_not_called()
 
 
+class OrderIndexTests(unittest.TestCase):
+    def _create_trader(self):
+        trader = create_trader(simulation_mode=False, risk_manager=create_risk_manager())
+        trader.is_running = True
+        trader._process_filled_order = MagicMock()
+        trader._reconcile_grid_with_open_orders = MagicMock()
+        trader.grid = [
+            {'order_id': 101, 'side': 'BUY', 'price': 99.0},
+            {'order_id': 102, 'side': 'SELL', 'price': 101.0},
+        ]
+        return trader
+
+    def test_fill_resolves_tracked_order_and_drops_entry(self):
+        trader = self._create_trader()
+        trader._track_order_id(1, 102)
+
+        trader.handle_order_update({'X': 'FILLED', 'i': 102, 's': 'BTCUSDT', 'S': 'SELL', 'p': '101', 'q': '0.1'})
+
+        trader._process_filled_order.assert_called_once_with(trader.grid[1], 1, 'SELL', 0.1, 101.0)
+        self.assertIsNone(trader.grid[1]['order_id'])
+        self.assertEqual(trader._order_index, {})
+
+    def test_stale_entry_falls_back_to_grid_scan(self):
+        trader = self._create_trader()
+        trader._track_order_id(1, 101)
+
+        self.assertEqual(trader._find_grid_level('101'), (trader.grid[0], 0))
+        self.assertEqual(trader._order_index, {'101': 0})
+        self.assertEqual(trader._find_grid_level('999'), (None, -1))
+
+
+class InitializeGridOrdersTests(unittest.TestCase):
+    def _create_trader(self):
+        trader = create_trader(simulation_mode=False, risk_manager=create_risk_manager())
+        self.calls = []
+        trader.binance_client.cancel_order.side_effect = lambda **kwargs: self.calls.append(('cancel', kwargs['order_id']))
+        trader._place_grid_order = MagicMock(side_effect=lambda level, index: self.calls.append(('place', index)) or True)
+        trader.calculate_market_metrics = MagicMock(return_value=(None, 0))
+        trader.last_atr_value = 0.01
+        trader.grid = [{'order_id': 5, 'side': 'BUY', 'price': 90.0}]
+        trader._order_index = {'5': 0}
+        return trader
+
+    def test_keeps_matching_orders_and_cancels_the_rest_before_placing(self):
+        trader = self._create_trader()
+        trader.grid = [
+            {'order_id': None, 'side': 'BUY', 'price': 99.0},
+            {'order_id': None, 'side': 'SELL', 'price': 101.0},
+        ]
+        trader._order_index = {}
+        trader.pending_orders = {'1': {'grid_index': 4}, '2': {'grid_index': 5}, '9': {'grid_index': 6}}
+        open_orders = [
+            {'orderId': 1, 'price': '99.05', 'side': 'BUY', 'origQty': '0.1'},
+            {'orderId': 2, 'price': '95.00', 'side': 'BUY', 'origQty': '0.1'},
+            {'orderId': 3, 'price': '101.00', 'side': 'SELL', 'origQty': '0.1', 'orderListId': 7},
+        ]
+
+        trader._initialize_grid_orders(open_orders)
+
+        self.assertEqual(trader.grid[0]['order_id'], 1)
+        self.assertEqual(trader._order_index, {'1': 0})
+        self.assertEqual(trader.pending_orders, {'1': {'grid_index': 0}})
+        self.assertEqual(self.calls, [('cancel', 2), ('place', 1)])
+
+    def test_empty_recalculation_keeps_current_grid(self):
+        trader = self._create_trader()
+        current_grid = trader.grid
+        trader._calculate_grid_levels = MagicMock(return_value=[])
+
+        self.assertFalse(trader._setup_grid())
+
+        self.assertIs(trader.grid, current_grid)
+        self.assertEqual(trader._order_index, {'5': 0})
+        trader.binance_client.get_open_orders.assert_not_called()
+        self.assertEqual(self.calls, [])
+
+    def test_failed_open_orders_fetch_keeps_current_grid(self):
+        trader = self._create_trader()
+        current_grid = trader.grid
+        trader._calculate_grid_levels = MagicMock(return_value=[{'order_id': None, 'side': 'BUY', 'price': 99.0}])
+        trader.binance_client.get_open_orders.side_effect = RuntimeError("timeout")
+
+        self.assertFalse(trader._setup_grid())
+
+        self.assertIs(trader.grid, current_grid)
+        self.assertEqual(trader._order_index, {'5': 0})
+        self.assertEqual(self.calls, [])
+
+    def test_realtime_recalculation_keeps_grid_when_open_orders_fetch_fails(self):
+        trader = self._create_trader()
+        current_grid = trader.grid
+        trader.is_running = True
+        trader.last_recalculation = None
+        trader._last_realtime_recalc = 0
+        trader._calculate_grid_levels = MagicMock(return_value=[{'order_id': None, 'side': 'BUY', 'price': 99.0}])
+        trader.binance_client.get_open_orders.side_effect = RuntimeError("timeout")
+
+        trader.handle_realtime_price(120.0)
+
+        self.assertIs(trader.grid, current_grid)
+        self.assertEqual(trader._order_index, {'5': 0})
+        trader.binance_client.cancel_order.assert_not_called()
+        self.assertEqual(self.calls, [])
+        self.assertIsNone(trader.last_recalculation)
+        self.assertEqual(trader._last_realtime_recalc, 0)
+
+
+class PlaceGridOrderTests(unittest.TestCase):
+    @patch('core.grid_trader.config')
+    def test_quantity_is_not_floored_below_exact_step(self, mock_config):
+        mock_config.TRADING_FEE_RATE = 0.001
+        trader = create_trader(simulation_mode=False, risk_manager=create_risk_manager())
+        trader.quantity_precision = 2
+        trader.capital_per_level = 10
+        trader._adjust_quantity_precision = GridTrader._adjust_quantity_precision.__get__(trader)
+        trader._should_pause_orders = MagicMock(return_value=False)
+        trader._setup_snapshot = None
+        trader.binance_client.get_best_bid_ask.return_value = (0.2, 0.2)
+        trader.grid = [{'order_id': None, 'side': 'BUY', 'price': 0.1, 'capital': 0.3}]
+
+        self.assertTrue(trader._place_grid_order(trader.grid[0], 0))
+
+        trader.binance_client.place_limit_order.assert_called_once_with('BTCUSDT', 'BUY', '3.00', '0.10')
+
+    def test_decimal_quantity_is_floored_without_float_conversion(self):
+        trader = create_trader(simulation_mode=False, risk_manager=create_risk_manager())
+        trader.quantity_precision = 2
+
+        # float() would round this up to 3.0 before flooring
+        formatted = GridTrader._adjust_quantity_precision(trader, Decimal('2.9999999999999999999'))
+
+        self.assertEqual(formatted, '2.99')
+
+
+class FundLockTests(unittest.TestCase):
+    def _create_trader(self, available):
+        trader = GridTrader.__new__(GridTrader)
+        trader.logger = logging.getLogger(f"grid_trader_test.{id(trader)}")
+        trader.binance_client = MagicMock()
+        trader.pending_locks = {}
+        trader._funds_epoch = 0
+        trader._setup_snapshot = None
+        trader.balance_lock = threading.Lock()
+        trader.binance_client.check_balance = MagicMock(
+            side_effect=lambda asset: self.assertFalse(trader.balance_lock.locked()) or available
+        )
+        return trader
+
+    def test_lock_funds_fetches_balance_outside_lock(self):
+        trader = self._create_trader(available=100.0)
+
+        self.assertTrue(trader._lock_funds('USDT', 60.0))
+        self.assertFalse(trader._lock_funds('USDT', 60.0))
+
+        self.assertEqual(trader.pending_locks, {'USDT': 60.0})
+        self.assertEqual(trader.binance_client.check_balance.call_count, 2)
+
+    def test_lock_funds_rereads_balance_released_during_fetch(self):
+        trader = self._create_trader(available=None)
+        trader.pending_locks = {'USDT': 60.0}
+        balances = [100.0, 40.0]
+
+        def check_balance(asset):
+            balance = balances.pop(0)
+            if balances:
+                # Another thread's order reaches the exchange between our read and our reservation
+                trader._release_funds('USDT', 60.0)
+            return balance
+
+        trader.binance_client.check_balance.side_effect = check_balance
+
+        self.assertFalse(trader._lock_funds('USDT', 60.0))
+        self.assertEqual(trader.pending_locks, {'USDT': 0.0})
+
+    def test_lock_funds_reads_under_lock_after_repeated_releases(self):
+        trader = self._create_trader(available=None)
+        trader.pending_locks = {'USDT': 30.0}
+        reads_under_lock = []
+
+        def check_balance(asset):
+            reads_under_lock.append(trader.balance_lock.locked())
+            if not trader.balance_lock.locked():
+                # A release lands during every read taken outside the lock
+                trader._release_funds('USDT', 10.0)
+            return 100.0
+
+        trader.binance_client.check_balance.side_effect = check_balance
+
+        self.assertTrue(trader._lock_funds('USDT', 60.0))
+        self.assertEqual(reads_under_lock, [False, False, False, True])
+        self.assertEqual(trader.pending_locks, {'USDT': 60.0})
+
+    def test_setup_pass_fetches_balance_once_and_draws_it_down(self):
+        trader = self._create_trader(available=100.0)
+        trader._setup_snapshot = (threading.get_ident(), {})
+
+        self.assertTrue(trader._lock_funds('USDT', 60.0))
+        trader._release_funds('USDT', 60.0)
+        trader._draw_setup_balance('USDT', 60.0)
+        self.assertFalse(trader._lock_funds('USDT', 60.0))
+
+        self.assertEqual(trader.binance_client.check_balance.call_count, 1)
+        self.assertEqual(trader._setup_snapshot[1], {'USDT': 40.0})
+
+
 if __name__ == '__main__':
     unittest.main()
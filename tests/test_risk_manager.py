@@ -51,6 +51,9 @@ class DummyBinanceClient(BinanceClient):
         self.time_offset = 0
         self.last_time_sync = int(time.time())
         self.time_sync_interval = 60 * 60
+        self._balance_cache = None
+        self._balance_epoch = 0
+        self.balance_ttl_ms = 1000
         self.symbol_price = 10.0
         self.asset = config.SYMBOL.replace("USDT", "")
         self._symbol_info = {
@@ -97,6 +100,14 @@ class RiskManagerOCOOrderTest(unittest.TestCase):
         self.assertNotIn("belowType", client.rest_client.captured_kwargs)
         self.assertIn("timestamp", client.rest_client.captured_kwargs)
 
+    def test_oco_price_range_uses_cached_filter_multipliers(self):
+        client = DummyBinanceClient()
+        manager = RiskManager(client)
+        self.assertEqual(manager.price_multipliers, (0.8, 1.2))
+
+        client.get_symbol_info = lambda symbol: self.fail("symbol info fetched per OCO order")
+        self.assertTrue(manager._place_oco_orders())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,7 @@ import types
 import threading
 import json
 from queue import Queue
+from collections import OrderedDict
 from unittest.mock import MagicMock
 import base64
 
@@ -109,7 +110,7 @@ def test_event_callback_handles_raw_user_event_without_wrapper():
 
     client._handle_message = BinanceWebSocketAPIClient._handle_message.__get__(client, BinanceWebSocketAPIClient)
     payload = {"e": "executionReport", "s": "BTCUSDT"}
-    client._handle_message(json.dumps(payload))
+    client._handle_message(json.dumps(payload).encode())
 
     callback.assert_called_once_with(payload, None)
 
@@ -301,3 +302,52 @@ def test_optional_parameters_get_open_orders():
     assert params["symbol"] == "BTCUSDT"
     assert params["recvWindow"] == 15000
     assert result["status"] == 200
+
+
+def _build_kline_adapter():
+    ws_adapter = BinanceWSClient.__new__(BinanceWSClient)
+    ws_adapter.logger = logging.getLogger("kline_cache_test")
+    ws_adapter._kline_cache = OrderedDict()
+    ws_adapter._kline_cache_lock = threading.Lock()
+    mock_inner = types.SimpleNamespace()
+    mock_inner._send_request = MagicMock(return_value="req-klines")
+    mock_inner._wait_for_response = MagicMock(return_value={"status": 200, "result": [[1, "1.0"]]})
+    ws_adapter.client = mock_inner
+    return ws_adapter, mock_inner
+
+
+def test_klines_closed_window_is_served_from_cache():
+    ws_adapter, mock_inner = _build_kline_adapter()
+
+    first = ws_adapter.klines("BTCUSDT", "1h", startTime=0, endTime=3_600_000, limit=1)
+    first["result"].clear()  # A caller mutating its response must not affect later callers
+    second = ws_adapter.klines("BTCUSDT", "1h", startTime=0, endTime=3_600_000, limit=1)
+
+    assert second == {"status": 200, "result": [[1, "1.0"]]}
+    mock_inner._send_request.assert_called_once_with(
+        "klines", {"symbol": "BTCUSDT", "interval": "1h", "limit": 1, "startTime": 0, "endTime": 3_600_000}
+    )
+
+
+def test_klines_live_window_expires_at_next_bar_close(monkeypatch):
+    ws_adapter, mock_inner = _build_kline_adapter()
+    now = [7_200.0 + 30]  # 30s into a 1m bar
+    monkeypatch.setattr("binance_api.websocket_api_client.time.time", lambda: now[0])
+
+    ws_adapter.klines("BTCUSDT", "1m", limit=5)
+    ws_adapter.klines("BTCUSDT", "1m", limit=5)
+    assert mock_inner._send_request.call_count == 1
+
+    now[0] = 7_200.0 + 60  # next bar opened
+    ws_adapter.klines("BTCUSDT", "1m", limit=5)
+    assert mock_inner._send_request.call_count == 2
+
+
+def test_klines_error_response_is_not_cached():
+    ws_adapter, mock_inner = _build_kline_adapter()
+    mock_inner._wait_for_response.return_value = {"status": 400, "error": {"code": -1121}}
+
+    ws_adapter.klines("BTCUSDT", "1m", limit=5)
+    ws_adapter.klines("BTCUSDT", "1m", limit=5)
+
+    assert mock_inner._send_request.call_count == 2
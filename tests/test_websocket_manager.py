@@ -0,0 +1,508 @@
+import gc
+import sys
+import json
+import types
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Ensure project root on path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Provide lightweight stubs for the stream client; these tests never open a socket
+try:
+    from binance.websocket.binance_socket_manager import BinanceSocketManager  # noqa: F401
+    from binance.websocket.spot.websocket_stream import SpotWebsocketStreamClient  # noqa: F401
+except ImportError:
+    socket_manager_module = types.ModuleType("binance.websocket.binance_socket_manager")
+    stream_module = types.ModuleType("binance.websocket.spot.websocket_stream")
+
+    class DummySocketManager:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class DummyStreamClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    socket_manager_module.BinanceSocketManager = DummySocketManager
+    stream_module.SpotWebsocketStreamClient = DummyStreamClient
+    sys.modules["binance.websocket.binance_socket_manager"] = socket_manager_module
+    sys.modules["binance.websocket.spot.websocket_stream"] = stream_module
+
+from websocket import ABNF
+
+from binance_api.schemas import AccountPositionMessage, BookTickerMessage, ExecutionReportMessage, KlineMessage
+from binance_api import websocket_manager
+from binance_api.websocket_manager import BytesSocketManager, MarketDataWebsocketManager
+
+
+BOOK_TICKER_PAYLOAD = {"u": 400900217, "s": "BNBUSDT", "b": "25.35", "B": "31.21", "a": "25.36", "A": "40.66"}
+
+KLINE_PAYLOAD = {
+    "e": "kline", "E": 1672515782136, "s": "BNBBTC",
+    "k": {
+        "t": 1672515780000, "T": 1672515839999, "s": "BNBBTC", "i": "1m",
+        "f": 100, "L": 200, "o": "0.0010", "c": "0.0020", "h": "0.0025", "l": "0.0015",
+        "v": "1000", "n": 100, "x": False, "q": "1.0000", "V": "500", "Q": "0.500", "B": "123456",
+    },
+}
+
+EXECUTION_REPORT_PAYLOAD = {
+    "e": "executionReport", "E": 1499405658658, "s": "ETHBTC", "c": "mUvoqJxFIILMdfAW5iGSOW",
+    "S": "BUY", "o": "LIMIT", "f": "GTC", "q": "1.00000000", "p": "0.10264410", "P": "0.00000000",
+    "F": "0.00000000", "g": -1, "C": "", "x": "TRADE", "X": "FILLED", "r": "NONE", "i": 4293153,
+    "l": "1.00000000", "z": "1.00000000", "L": "0.10264410", "n": "0", "N": None, "T": 1499405658657,
+    "t": 12, "v": 3, "I": 8641984, "w": False, "m": False, "M": False, "O": 1499405658657,
+    "Z": "0.10264410", "Y": "0.10264410", "Q": "0.00000000", "W": 1499405658657, "V": "NONE",
+}
+
+
+def _build_manager(on_message_callback=None, on_error_callback=None):
+    """Build a manager that records delivered messages without opening a socket."""
+    received = []
+    manager = MarketDataWebsocketManager(
+        on_message_callback=on_message_callback or received.append, on_error_callback=on_error_callback
+    )
+    return manager, received
+
+
+def _attach_client(manager, socket_manager=None):
+    """Give the manager a mocked stream client, optionally reading from socket_manager."""
+    client = MagicMock()
+    if socket_manager is not None:
+        client.socket_manager = socket_manager
+    manager.ws_client = client
+    manager.is_running = True
+    return client
+
+
+def _socket_manager(connected=True, **attrs):
+    """Stand-in for the socket manager that reports errors to the manager."""
+    return types.SimpleNamespace(ws=types.SimpleNamespace(connected=connected), **attrs)
+
+
+def _frame(data, stream=None, as_text=False):
+    """Encode a payload as a compact JSON frame, wrapped in a combined envelope when stream is given."""
+    message = data if stream is None else {"stream": stream, "data": data}
+    text = json.dumps(message, separators=(",", ":"))
+    return text if as_text else text.encode()
+
+
+def _build_bytes_socket_manager(**attrs):
+    """Build a BytesSocketManager without connecting."""
+    socket_manager = BytesSocketManager.__new__(BytesSocketManager)
+    for name, value in attrs.items():
+        setattr(socket_manager, name, value)
+    return socket_manager
+
+
+class _ManualTimer:
+    """threading.Timer stand-in that records scheduled callbacks instead of running them"""
+
+    scheduled = []
+
+    def __init__(self, interval, function):
+        self.interval = interval
+        self.function = function
+        self.daemon = False
+        self.cancelled = False
+
+    def start(self):
+        self.scheduled.append(self)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+@pytest.fixture
+def manual_timers(monkeypatch):
+    """Route reconnect backoff timers to _ManualTimer and return the list of scheduled timers."""
+    monkeypatch.setattr(websocket_manager.threading, "Timer", _ManualTimer)
+    monkeypatch.setattr(_ManualTimer, "scheduled", [])
+    return _ManualTimer.scheduled
+
+
+def test_subscription_ack_is_not_delivered():
+    manager, received = _build_manager()
+
+    manager._message_handler(None, _frame({"result": None, "id": 1}, as_text=True))
+
+    assert received == []
+
+
+def test_raw_bookticker_payload_is_routed_to_bookticker_handler():
+    manager, received = _build_manager()
+
+    manager._message_handler(None, _frame(BOOK_TICKER_PAYLOAD, as_text=True))
+
+    assert len(received) == 1
+    assert received[0].s == "BNBUSDT"
+    assert received[0].b == "25.35"
+    assert received[0].a == "25.36"
+
+
+def test_combined_bookticker_is_decoded_into_typed_schema():
+    manager, received = _build_manager()
+
+    manager._message_handler(None, _frame(BOOK_TICKER_PAYLOAD, stream="bnbusdt@bookTicker"))
+
+    assert received == [BookTickerMessage(s="BNBUSDT", b="25.35", B="31.21", a="25.36", A="40.66", u=400900217)]
+
+
+def test_combined_kline_is_decoded_into_typed_schema():
+    manager, received = _build_manager()
+
+    manager._message_handler(None, _frame(KLINE_PAYLOAD, stream="bnbbtc@kline_1m"))
+
+    kline = received[-1]
+    assert isinstance(kline, KlineMessage)
+    assert kline.e == "kline"
+    assert kline.k.c == "0.0020"
+    assert kline.k.x is False
+
+
+def test_combined_message_triggers_single_callback():
+    manager, received = _build_manager()
+
+    manager._message_handler(None, _frame(KLINE_PAYLOAD, stream="bnbbtc@kline_1m", as_text=True))
+
+    assert len(received) == 1
+    assert isinstance(received[0], KlineMessage)
+
+
+def test_event_without_schema_is_delivered_as_dict():
+    manager, received = _build_manager()
+    payload = {"e": "executionReport", "E": 1, "s": "BTCUSDT", "X": "FILLED"}
+
+    manager._message_handler(None, _frame(payload, stream="listenkey", as_text=True))
+
+    assert received[-1] == payload
+
+
+def test_execution_report_is_decoded_into_typed_schema():
+    manager, received = _build_manager()
+
+    manager._message_handler(None, _frame(EXECUTION_REPORT_PAYLOAD, stream="listenkey"))
+
+    report = received[-1]
+    assert isinstance(report, ExecutionReportMessage)
+    assert report.e == "executionReport"
+    assert (report.X, report.i, report.S, report.p) == ("FILLED", 4293153, "BUY", "0.10264410")
+
+
+def test_account_position_balances_are_typed():
+    manager, received = _build_manager()
+    payload = {
+        "e": "outboundAccountPosition", "E": 1564034571105, "u": 1564034571073,
+        "B": [{"a": "ETH", "f": "10000.000000", "l": "0.000000"}],
+    }
+
+    manager._message_handler(None, _frame(payload))
+
+    position = received[-1]
+    assert isinstance(position, AccountPositionMessage)
+    assert position.B[0].a == "ETH"
+    assert position.B[0].f == "10000.000000"
+
+
+def test_routing_error_does_not_redeliver_message():
+    calls = []
+
+    def on_message(message):
+        calls.append(message)
+        raise TypeError("consumer bug")
+
+    manager, _ = _build_manager(on_message_callback=on_message)
+
+    manager._process_message(_frame(KLINE_PAYLOAD))
+
+    assert len(calls) == 1
+
+
+def test_malformed_frame_is_dropped():
+    manager, received = _build_manager()
+
+    manager._process_message(b'{"e":"kline",')
+
+    assert received == []
+
+
+def test_market_messages_are_frozen_and_untracked():
+    manager, received = _build_manager()
+
+    manager._process_message(_frame(KLINE_PAYLOAD))
+
+    kline = received[-1]
+    assert isinstance(kline, KlineMessage)
+    assert not gc.is_tracked(kline)
+    assert hash(kline) == hash(kline)
+
+
+def test_reconnect_reuses_existing_stream_client():
+    manager, _ = _build_manager()
+    client = _attach_client(manager)
+    manager.symbols = {"BTCUSDT"}
+    manager.kline_intervals = {"btcusdt": "1m"}
+    manager.bookticker_symbols = {"btcusdt"}
+
+    manager._reconnect_streams()
+
+    assert manager.ws_client is client
+    client.reconnect.assert_called_once_with()
+    client.subscribe.assert_called_once_with(["btcusdt@kline_1m", "btcusdt@bookTicker"])
+
+
+def test_reconnect_reuses_stream_names_until_subscriptions_change():
+    manager, _ = _build_manager()
+    _attach_client(manager)
+    manager.start_trade_stream("BTCUSDT")
+
+    first = manager._subscribed_stream_names()
+    assert manager._subscribed_stream_names() is first
+
+    manager.start_bookticker_stream("ETHUSDT")
+
+    assert manager._subscribed_stream_names() == ("btcusdt@trade", "ethusdt@bookTicker")
+
+
+def test_transient_error_resubscribes_without_redial():
+    manager, _ = _build_manager()
+    error = ValueError("bad frame")
+    socket_manager = _socket_manager(callback_error=error)
+    client = _attach_client(manager, socket_manager)
+    manager.symbols = {"BTCUSDT"}
+    manager.trade_symbols = {"btcusdt"}
+    manager._try_reconnect = MagicMock()
+
+    manager._error_handler(socket_manager, error)
+
+    client.reconnect.assert_not_called()
+    client.subscribe.assert_called_once_with(["btcusdt@trade"])
+    manager._try_reconnect.assert_not_called()
+
+
+def test_read_error_on_connected_socket_triggers_full_reconnect():
+    manager, _ = _build_manager()
+    socket_manager = _socket_manager()
+    client = _attach_client(manager, socket_manager)
+    manager._try_reconnect = MagicMock()
+
+    manager._error_handler(socket_manager, ValueError("reader failed"))
+
+    client.subscribe.assert_not_called()
+    manager._try_reconnect.assert_called_once_with()
+
+
+def test_connection_error_triggers_full_reconnect():
+    manager, _ = _build_manager()
+    socket_manager = _socket_manager()
+    client = _attach_client(manager, socket_manager)
+    manager._try_reconnect = MagicMock()
+
+    manager._error_handler(socket_manager, ConnectionResetError("reset by peer"))
+
+    client.subscribe.assert_not_called()
+    manager._try_reconnect.assert_called_once_with()
+
+
+def test_error_from_replaced_socket_is_ignored():
+    errors = []
+    manager, _ = _build_manager(on_error_callback=errors.append)
+    _attach_client(manager, _socket_manager())
+    manager._try_reconnect = MagicMock()
+
+    manager._error_handler(_socket_manager(connected=False), ConnectionResetError("reset by peer"))
+
+    assert errors == []
+    manager._try_reconnect.assert_not_called()
+
+
+def test_try_reconnect_schedules_backoff_without_blocking(manual_timers):
+    manager, _ = _build_manager()
+    manager.is_running = True
+    manager.max_reconnect_attempts = 3
+    manager._reconnect_streams = MagicMock(side_effect=ConnectionError("down"))
+
+    manager._try_reconnect()
+    manager._try_reconnect()  # A second error while an attempt is pending
+
+    assert len(manual_timers) == 1
+    manager._reconnect_streams.assert_not_called()
+
+    intervals = []
+    while manual_timers:
+        timer = manual_timers.pop(0)
+        intervals.append(timer.interval)
+        timer.function()
+
+    assert intervals == [5, 10, 20]
+    assert manager._reconnect_streams.call_count == 3
+    assert manager.current_reconnect_attempt == 3
+
+
+def test_stop_cancels_pending_reconnect(manual_timers):
+    manager, _ = _build_manager()
+    manager.is_running = True
+    manager._reconnect_streams = MagicMock()
+
+    manager._try_reconnect()
+    timer = manual_timers[0]
+    manager.stop()
+    manager.is_running = True  # Timer fired before it could be cancelled
+    timer.function()
+
+    assert timer.cancelled
+    manager._reconnect_streams.assert_not_called()
+    manager._try_reconnect()
+    assert len(manual_timers) == 1
+
+
+def test_start_multiple_streams_sends_single_subscribe():
+    manager, _ = _build_manager()
+    client = _attach_client(manager)
+
+    manager.start_multiple_streams("BTCUSDT", ["kline_1m", "depth", "trade", "bookticker"])
+
+    client.subscribe.assert_called_once_with(
+        ["btcusdt@kline_1m", "btcusdt@depth@100ms", "btcusdt@trade", "btcusdt@bookTicker"]
+    )
+    assert manager.kline_intervals == {"btcusdt": "1m"}
+    assert manager.depth_speeds == {"btcusdt": 100}
+
+
+def test_start_multiple_streams_rejects_unknown_stream_before_subscribing():
+    manager, _ = _build_manager()
+    client = _attach_client(manager)
+
+    with pytest.raises(ValueError):
+        manager.start_multiple_streams("BTCUSDT", ["trade", "ticker"])
+
+    client.subscribe.assert_not_called()
+    assert manager.trade_symbols == set()
+
+
+def test_repeat_subscriptions_reuse_stream_key():
+    manager, _ = _build_manager()
+    _attach_client(manager)
+
+    manager.start_trade_stream("BTCUSDT")
+    manager.start_bookticker_stream("BTCUSDT")
+
+    assert manager.symbols == {"BTCUSDT"}
+    assert manager._stream_keys == {"BTCUSDT": "btcusdt"}
+    assert next(iter(manager.trade_symbols)) is next(iter(manager.bookticker_symbols))
+
+
+def test_bytes_socket_manager_passes_raw_frame_bytes():
+    received = []
+    socket_manager = _build_bytes_socket_manager(on_message=lambda _, message: received.append(message))
+    socket_manager._callback = lambda callback, *args: callback(socket_manager, *args)
+
+    socket_manager._handle_data(ABNF.OPCODE_TEXT, types.SimpleNamespace(data=b'{"e":"trade"}'), "")
+
+    assert received == [b'{"e":"trade"}']
+
+
+def test_bytes_socket_manager_flags_callback_errors():
+    errors = []
+    socket_manager = _build_bytes_socket_manager(logger=MagicMock(), _handle_exception=errors.append)
+    error = TypeError("consumer bug")
+
+    def on_message(_, message):
+        raise error
+
+    socket_manager._callback(on_message, b"{}")
+
+    assert errors == [error]
+    assert socket_manager.callback_error is error
+
+
+def test_bytes_socket_manager_skips_utf8_validation(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "binance_api.websocket_manager.create_connection",
+        lambda url, **kwargs: calls.append((url, kwargs)) or MagicMock(),
+    )
+    socket_manager = _build_bytes_socket_manager(
+        stream_url="wss://stream.example/stream", timeout=None, _proxy_params={}, logger=MagicMock(), on_open=None
+    )
+    socket_manager._callback = lambda callback, *args: None
+
+    socket_manager.create_ws_connection()
+
+    assert calls == [("wss://stream.example/stream", {"timeout": None, "skip_utf8_validation": True})]
+
+
+def test_decode_loop_processes_frames_off_socket_thread():
+    delivered = threading.Event()
+    threads = []
+
+    def on_message(message):
+        threads.append(threading.current_thread())
+        delivered.set()
+
+    manager, _ = _build_manager(on_message_callback=on_message)
+    manager._start_decode_loop()
+    try:
+        manager._message_handler(None, _frame(KLINE_PAYLOAD))
+        assert delivered.wait(timeout=5)
+    finally:
+        loop_thread = manager._loop_thread
+        manager.stop()
+
+    assert threads == [loop_thread]
+    assert not loop_thread.is_alive()
+
+
+def test_burst_of_frames_wakes_decode_loop_once():
+    manager, received = _build_manager()
+    manager._loop = MagicMock()
+
+    for _ in range(3):
+        manager._message_handler(None, _frame(KLINE_PAYLOAD))
+
+    manager._loop.call_soon_threadsafe.assert_called_once_with(manager._drain_messages)
+    manager._drain_messages()
+    assert len(received) == 3
+    assert not manager._pending
+
+
+def test_full_buffer_drops_market_data_but_never_user_data(monkeypatch):
+    manager, received = _build_manager()
+    manager._loop = MagicMock()
+    manager._user_stream_prefix = b'{"stream":"listenkey"'
+    monkeypatch.setattr(MarketDataWebsocketManager, "_QUEUE_MAXSIZE", 2)
+
+    for _ in range(3):
+        manager._message_handler(None, _frame(EXECUTION_REPORT_PAYLOAD, stream="listenkey"))
+        manager._message_handler(None, _frame(KLINE_PAYLOAD, stream="bnbbtc@kline_1m"))
+
+    assert manager.dropped_frames == 1
+    assert len(manager._pending_user) == 3
+    manager._drain_messages()
+    assert [type(message) for message in received] == [ExecutionReportMessage] * 3 + [KlineMessage] * 2
+
+
+def test_dropped_frames_are_reported_from_decode_loop_at_most_once_per_interval(monkeypatch, caplog):
+    manager, _ = _build_manager()
+    manager._loop = MagicMock()
+    monkeypatch.setattr(MarketDataWebsocketManager, "_QUEUE_MAXSIZE", 1)
+    frame = _frame(KLINE_PAYLOAD, stream="bnbbtc@kline_1m")
+
+    with caplog.at_level("WARNING", logger=websocket_manager.__name__):
+        for _ in range(2):
+            logged = len(caplog.records)
+            for _ in range(5):
+                manager._message_handler(None, frame)
+            assert len(caplog.records) == logged  # Nothing is logged on the socket thread
+            manager._drain_messages()
+
+    assert manager.dropped_frames == 8
+    assert [record.getMessage() for record in caplog.records] == [
+        "Decode buffer full, dropped 4 oldest market data frames (4 dropped in total)"
+    ]
@@ -8,7 +8,7 @@ class TelegramBot:
     def __init__(self, token, allowed_users, grid_trader=None, risk_manager=None, on_symbol_change=None):
         """Initialize the Telegram bot with the given token and allowed users"""
         self.application = Application.builder().token(token).build()
-        self.allowed_users = allowed_users
+        self.allowed_users = frozenset(allowed_users)  # Checked on every incoming update
         self.grid_trader = grid_trader
         self.risk_manager = risk_manager
         self.on_symbol_change = on_symbol_change  # Optional callback to propagate symbol changes to controller
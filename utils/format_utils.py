@@ -1,9 +1,15 @@
 import decimal
+import functools
 from decimal import Decimal, ROUND_FLOOR, ROUND_HALF_UP, getcontext
 
 # 设置更高的精度以处理各种货币 (包括高值如BTC和低值如SHIB)
 getcontext().prec = 28
 
+@functools.lru_cache(maxsize=None)
+def _step_size_for_precision(precision):
+    """Decimal step for a precision, e.g. 2 -> Decimal('0.01'); built once per precision"""
+    return Decimal(1).scaleb(-precision)
+
 def format_price(price, precision):
     """Format price with appropriate precision ensuring non-zero values and adherence to exchange tick size
     
@@ -30,30 +36,11 @@ def format_price(price, precision):
         # 返回基于精度的最小有效价格
         return f"0.{'0' * (precision - 1)}1" if precision > 0 else "1"
     
-    # 计算基于精度的tick_size (例如 精度为7 -> tick size 0.0000001)
-    tick_size = Decimal('0.1') ** precision
-    
-    # 四舍五入至最接近的tick_size
-    remainder = decimal_price % tick_size
-    
-    # 如果余数非常接近tick_size (由于浮点精度的限制)，向上取整
-    if remainder > Decimal('0') and (tick_size - remainder) / tick_size < Decimal('0.000001'):
-        # 几乎是tick_size的整数倍，直接进位
-        rounded_price = decimal_price - remainder + tick_size
-    else:
-        # 标准四舍五入到最近的tick_size
-        rounded_price = decimal_price - remainder
-        # 如果余数大于等于tick_size的一半，进位
-        if remainder >= (tick_size / Decimal('2')):
-            rounded_price += tick_size
-    
-    # 确保四舍五入后的价格是tick_size的整数倍
-    # 这是交易所要求的，避免订单被拒绝
-    if rounded_price % tick_size != Decimal('0'):
-        # 通过除后再乘处理任何可能的精度偏差
-        factor = rounded_price / tick_size
-        whole_factor = Decimal(int(factor))  # 取整数部分
-        rounded_price = whole_factor * tick_size
+    # 基于精度的tick_size (例如 精度为7 -> tick size 0.0000001)，每个精度只构造一次
+    tick_size = _step_size_for_precision(precision)
+    
+    # 单次quantize四舍五入至最接近的tick_size，结果必然是tick_size的整数倍，无需取余修正
+    rounded_price = decimal_price.quantize(tick_size, rounding=ROUND_HALF_UP)
     
     # 格式化为所需小数位数，确保不损失精度
     formatted = f"{rounded_price:.{precision}f}"
@@ -94,20 +81,18 @@ def format_quantity(quantity, precision):
         # 返回零，但确保格式正确
         return f"0.{'0' * precision}" if precision > 0 else "0"
     
-    # 计算基于精度的step_size (例如 精度为0 -> step 1, 精度为2 -> step 0.01)
-    step_size = Decimal('0.1') ** precision
+    # 基于精度的step_size (例如 精度为0 -> step 1, 精度为2 -> step 0.01)
+    step_size = _step_size_for_precision(precision)
     
     # Binance要求数量必须向下取整到step_size的倍数
-    # 使用ROUND_FLOOR确保总是向下取整
-    factor = decimal_quantity / step_size
-    whole_factor = factor.to_integral_value(rounding=ROUND_FLOOR)
-    floored_quantity = (whole_factor * step_size).quantize(step_size, rounding=ROUND_FLOOR)
+    # 使用ROUND_FLOOR的单次quantize完成向下取整，无需先除后乘
+    floored_quantity = decimal_quantity.quantize(step_size, rounding=ROUND_FLOOR)
     
     # 格式化为正确的小数位数
     formatted = f"{floored_quantity:.{precision}f}"
     
-    # 确保不会因为数值太小而格式化为"0"
-    if formatted == f"0.{'0' * precision}":
+    # 确保不会因为数值太小而格式化为"0" (直接比较Decimal，无需构造零值字符串)
+    if precision > 0 and not floored_quantity:
         # 如果向下取整后为零但原数量不为零，返回最小有效数量
         if decimal_quantity > Decimal('0'):
             return f"0.{'0' * (precision - 1)}1" if precision > 0 else "1"
@@ -153,32 +138,9 @@ def get_precision_from_step_size(step_size):
         if step == 0:
             return 0
         
-        # 处理规范化的形式
-        normalized = step.normalize()
-        if normalized == normalized.to_integral():
-            # 整数值
-            return 0
-        
-        # 从规范化的小数中获取精度 - 转换为字符串以统计小数位
-        step_str = str(normalized)
-        if 'E' in step_str or 'e' in step_str:
-            # 处理科学记数法
-            parts = step_str.lower().split('e')
-            if len(parts) == 2:
-                if parts[1].startswith('-'):
-                    return abs(int(parts[1]))
-                else:
-                    mantissa = parts[0].replace('.', '')
-                    exponent = int(parts[1])
-                    if exponent < len(mantissa):
-                        return 0
-                    return exponent - len(mantissa) + 1
-        elif '.' in step_str:
-            # 处理小数表示法
-            decimal_part = step_str.split('.')[1].rstrip('0')
-            return len(decimal_part)
-        
-        return 0
+        # 规范化后的指数即为小数位数 (例如 0.00010000 -> 1E-4 -> 4, 10 -> 1E+1 -> 0)
+        exponent = step.normalize().as_tuple().exponent
+        return max(0, -exponent)
     except Exception:
         # 如果出现错误则返回安全的默认值
         return 8 if str(step_size).startswith('0.') else 0